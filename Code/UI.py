@@ -1,5 +1,61 @@
 import pygame
-from settings import screen_width, screen_height
+from settings import screen_width, screen_height, show_entity_counter, show_pool_counter
+from assets import registry
+
+
+class HudWidget:
+    """
+    Represents a panel of the HUD, showing an icon and a value.
+
+    - The panel is kept between frames, and rendered again only when its value changes.
+    - Drawing an unchanged panel is a single blit.
+
+    Attributes:
+        panel: The pygame.Surface of the panel, holding the icon and the rendered value.
+        pos: The position of the panel on the screen.
+        icon: The icon of the panel (None if the panel has no icon).
+        font: The font used to render the value.
+        text_pos: The position of the value on the panel.
+        format: A function that turns the value into the displayed text.
+        value: The value the panel is currently showing.
+        rendered: True once the panel has been rendered for the first time.
+
+    Methods:
+        - set(value)
+        - draw(surface)
+    """
+
+    def __init__(self, size, pos, icon, font, text_pos, format=str):
+        self.panel = pygame.surface.Surface(size, pygame.SRCALPHA)
+        self.pos = pos
+        self.icon = icon
+        self.font = font
+        self.text_pos = text_pos
+        self.format = format
+        self.value = None
+        self.rendered = False
+
+    def set(self, value):
+        """
+        Updates the value of the panel, the panel is rendered again only if the value changed.
+
+        Parameters:
+            value: The new value to display.
+        """
+        if self.rendered and value == self.value:
+            return
+
+        self.value = value
+        self.rendered = True
+        self.panel.fill((0, 0, 0, 0))
+        if self.icon:
+            self.panel.blit(self.icon, (0, 0))
+        text_surf = self.font.render(self.format(value), True, "White")
+        self.panel.blit(text_surf, self.text_pos)
+
+    def draw(self, surface):
+        """Draws the panel on the given surface."""
+        surface.blit(self.panel, self.pos)
 
 
 class UI:
@@ -8,38 +64,122 @@ class UI:
 
     - This class manages and displays UI elements, such as the player's lives and coin count,
       on the specified surface.
+    - Every element is a HudWidget, that is rendered again only when its value changes.
+    - More widgets (e.g. a timer or a score) can be registered with add_widget, and displayed with show.
 
     Methods:
+        - add_widget(name, widget)
+        - show(name, value)
         - show_lives(current)
         - show_coins(amount)
+        - show_entity_counts(counts)
+        - show_sprite_counts(counts)
+        - show_pool_stats(stats)
     """
 
     def __init__(self, surface):
 
         # SETUP
         self.display_surface = surface
-
-    def show_lives(self, current):
+        self.font = registry.font("../Packages/Fonts/Super-Mario-Bros.ttf", 40)
+        self.widgets = {}
+
+        # WIDGETS
+        self.add_widget(
+            "lives",
+            HudWidget(
+                (150, 70),
+                (50, 30),
+                registry.image("../Packages/UI/head_icon.png", (0, 0, 0)),
+                self.font,
+                (70, 10),
+                lambda current: f"x{current}",
+            ),
+        )
+        self.add_widget(
+            "coins",
+            HudWidget(
+                (200, 70),
+                (screen_width - 230, 30),
+                registry.image("../Packages/Textures/map/objects/coin.png", (0, 0, 0)),
+                self.font,
+                (60, 0),
+                # Format the coin count to be displayed with leading zeroes
+                lambda amount: f"{(3 - len(str(amount))) * '0'}{amount}",
+            ),
+        )
+        if show_entity_counter:
+            # Debug counter of the live, active and dormant entities of the level
+            self.add_widget(
+                "entities",
+                HudWidget(
+                    (500, 50),
+                    (50, 110),
+                    None,
+                    registry.font("../Packages/Fonts/Super-Mario-Bros.ttf", 20),
+                    (0, 0),
+                    lambda counts: f"live {counts[0]} active {counts[1]} dormant {counts[2]}",
+                ),
+            )
+            # Next to it, the enemies and animated tiles near the view, out of all of them
+            self.add_widget(
+                "sprites",
+                HudWidget(
+                    (400, 50),
+                    (550, 110),
+                    None,
+                    registry.font("../Packages/Fonts/Super-Mario-Bros.ttf", 20),
+                    (0, 0),
+                    lambda counts: f"visible {counts[0]}/{counts[1]}",
+                ),
+            )
+        if show_pool_counter:
+            # Debug counter of the object pools and the particles of the level: in use / size, and the high-water mark
+            self.add_widget(
+                "pools",
+                HudWidget(
+                    (1100, 50),
+                    (50, 150),
+                    None,
+                    registry.font("../Packages/Fonts/Super-Mario-Bros.ttf", 20),
+                    (0, 0),
+                    lambda stats: " ".join(
+                        f"{kind} {in_use}/{size} max {high_water}"
+                        for kind, (size, in_use, high_water) in stats.items()
+                    ),
+                ),
+            )
+
+    def add_widget(self, name, widget):
         """
-        Displays the player's remaining lives on the UI.
+        Registers a widget of the HUD.
 
         Parameters:
-            current (int): The current number of lives of the player.
+            name (str): The name the widget is shown by.
+            widget (HudWidget): The widget to register.
         """
+        self.widgets[name] = widget
 
-        self.life_panel_surface = pygame.surface.Surface((150, 70), pygame.SRCALPHA)
-        self.life_panel_font = pygame.font.Font(
-            "../Packages/Fonts/Super-Mario-Bros.ttf", 40
-        )
+    def show(self, name, value):
+        """
+        Displays a widget of the HUD with the given value.
 
-        self.head_icon = pygame.image.load("../Packages/UI/head_icon.png")
-        self.head_icon.set_colorkey((0, 0, 0))
-        self.life_panel_surface.blit(self.head_icon, (0, 0))
+        Parameters:
+            name (str): The name of the widget.
+            value: The value to display.
+        """
+        widget = self.widgets[name]
+        widget.set(value)
+        widget.draw(self.display_surface)
 
-        self.lives_text_surf = self.life_panel_font.render(f"x{current}", True, "White")
-        self.life_panel_surface.blit(self.lives_text_surf, (70, 10))
+    def show_lives(self, current):
+        """
+        Displays the player's remaining lives on the UI.
 
-        self.display_surface.blit(self.life_panel_surface, (50, 30))
+        Parameters:
+            current (int): The current number of lives of the player.
+        """
+        self.show("lives", current)
 
     def show_coins(self, amount):
         """
@@ -48,21 +188,34 @@ class UI:
         Parameters:
             amount (int): The current number of coins collected by the player.
         """
+        self.show("coins", amount)
 
-        self.coin_panel_surface = pygame.surface.Surface((200, 70), pygame.SRCALPHA)
-        self.coin_panel_font = pygame.font.Font(
-            "../Packages/Fonts/Super-Mario-Bros.ttf", 40
-        )
+    def show_entity_counts(self, counts):
+        """
+        Displays the debug counter of the live, active and dormant entities, if it's enabled in the settings.
 
-        self.coin_icon = pygame.image.load("../Packages/Textures/map/objects/coin.png")
-        self.coin_icon.set_colorkey((0, 0, 0))
-        self.coin_panel_surface.blit(self.coin_icon, (0, 0))
+        Parameters:
+            counts (tuple): The number of live, active and dormant entities, from Level.entity_counts.
+        """
+        if "entities" in self.widgets:
+            self.show("entities", counts)
 
-        # Format the coin count to be displayed with leading zeroes
-        self.coin_text_surf = self.coin_panel_font.render(
-            f"{(3 - len(str(amount))) * '0'}{amount}", True, "White"
-        )
-        self.coin_panel_surface.blit(self.coin_text_surf, (60, 00))
+    def show_sprite_counts(self, counts):
+        """
+        Displays the debug counter of the visible sprites, if the entity counter is enabled in the settings.
 
-        # Display the coin panel on the UI at the appropriate position
-        self.display_surface.blit(self.coin_panel_surface, (screen_width - 230, 30))
+        Parameters:
+            counts (tuple): The number of visible sprites, and of all of them, from Level.visible_sprite_count.
+        """
+        if "sprites" in self.widgets:
+            self.show("sprites", counts)
+
+    def show_pool_stats(self, stats):
+        """
+        Displays the debug counter of the object pools, if it's enabled in the settings.
+
+        Parameters:
+            stats (dict): The size, the objects in use and the high-water mark of every pool, from Level.pool_stats.
+        """
+        if "pools" in self.widgets:
+            self.show("pools", stats)
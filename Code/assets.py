@@ -0,0 +1,375 @@
+import os
+import pygame
+from game_data import levels
+from settings import rotation_steps
+
+
+class AssetRegistry:
+    """
+    Central registry for every image and font used by the game.
+
+    - Each file is read from disk only once, then the same surface is handed out to every caller.
+    - Surfaces are converted to the display format as soon as a display exists, and the colorkey is applied by the
+      registry, so the call sites don't have to set them up again.
+    - Scene manifests list the assets of the menu, the overworld and every level, so they can be preloaded before the
+      scene starts, and no disk I/O happens during the frames.
+    - Transformed variants of the shared frames (mirrored, rotated, faded) are derived once per source frame and
+      cached, so animating a sprite never creates a surface during the frames.
+    - The collision masks of the frames (and of their mirrored variants) are also computed once and cached, so
+      pixel-accurate hit tests only cost the overlap test.
+
+    Attributes:
+        decoded: A dictionary of the surfaces read from disk before the display existed, keyed by path.
+        images: A dictionary of the prepared surfaces, keyed by (path, colorkey, convert).
+        folders: A dictionary of the loaded frame sequences, keyed by (path, colorkey, convert).
+        scaled_folders: A dictionary of the frame sequences scaled to a fixed size, keyed by (path, size, convert).
+        states: A dictionary of the loaded character states, keyed by path.
+        fonts: A dictionary of the loaded fonts, keyed by (path, size).
+        flips: A dictionary of the horizontally mirrored frames, keyed by the source frame.
+        rotations: A dictionary of the rotation tables (one frame per quantized angle), keyed by the source frame.
+        fades: A dictionary of the translucent frames, keyed by (source frame, alpha).
+        masks: A dictionary of the collision masks of the frames, keyed by the frame.
+        disk_loads: The number of files read from disk so far.
+
+    Methods:
+        - image(path, colorkey=None, convert=True)
+        - folder(path, colorkey=None, convert=True)
+        - scaled_folder(path, size, convert=True)
+        - character_states(path, colorkey=None)
+        - font(path, size)
+        - flipped(frame)
+        - rotated(frame, angle)
+        - faded(frame, alpha)
+        - mask(frame)
+        - prepare_masks(frames)
+        - preload(scene)
+    """
+
+    def __init__(self):
+        self.decoded = {}
+        self.images = {}
+        self.folders = {}
+        self.scaled_folders = {}
+        self.states = {}
+        self.fonts = {}
+        self.flips = {}
+        self.rotations = {}
+        self.fades = {}
+        self.masks = {}
+        self.disk_loads = 0
+
+    def image(self, path, colorkey=None, convert=True):
+        """
+        Returns the shared surface of the image at the given path, loading it on the first request.
+        - Before the display is created, surfaces can't be converted, so they are handed out unconverted and the
+          conversion happens on the first request after the display exists. The colorkey is still applied, on a copy
+          of the decoded surface (it's shared by the requests with other colorkeys).
+
+        Parameters:
+            path (str): The path to the image file.
+            colorkey (tuple, optional): The colorkey applied to the surface. Defaults to None.
+            convert (bool, optional): Converts the surface to the display format if True. Defaults to True.
+
+        Returns:
+            surface (pygame.Surface): The shared surface of the image.
+        """
+        key = (path, colorkey, convert)
+        if key in self.images:
+            return self.images[key]
+
+        surface = self.decoded.get(path)
+        if surface is None:
+            self.disk_loads += 1
+            surface = pygame.image.load(path)
+
+        if convert and not self.display_ready():
+            self.decoded[path] = surface
+            if colorkey is not None:
+                surface = surface.copy()
+                surface.set_colorkey(colorkey)
+            return surface
+        self.decoded.pop(path, None)
+
+        if convert:
+            surface = surface.convert_alpha() if self.has_alpha(surface) else surface.convert()
+        if colorkey is not None:
+            surface.set_colorkey(colorkey)
+
+        self.images[key] = surface
+        return surface
+
+    @staticmethod
+    def display_ready():
+        """Returns True if the display exists, so surfaces can be converted to its format."""
+        return pygame.display.get_surface() is not None
+
+    @staticmethod
+    def has_alpha(surface):
+        """Returns True if the surface has per-pixel alpha."""
+        return bool(surface.get_flags() & pygame.SRCALPHA)
+
+    def folder(self, path, colorkey=None, convert=True):
+        """
+        Returns the frames of every image inside the given folder, in sorted file name order.
+
+        Parameters:
+            path (str): The path to the folder containing image frames.
+            colorkey (tuple, optional): The colorkey applied to the frames. Defaults to None.
+            convert (bool, optional): Converts the frames to the display format if True. Defaults to True.
+
+        Returns:
+            frames (tuple): A tuple of pygame.Surface objects representing the image frames.
+        """
+        key = (path, colorkey, convert)
+        if key in self.folders:
+            return self.folders[key]
+
+        frames = tuple(
+            self.image(path + "/" + img_file, colorkey, convert)
+            for img_file in sorted(os.listdir(path))
+        )
+        if not convert or self.display_ready():
+            self.folders[key] = frames
+        return frames
+
+    def scaled_folder(self, path, size, convert=True):
+        """
+        Returns the frames of every image inside the given folder, in sorted file name order, scaled to the given size.
+        - Only the scaled frames are kept, the frames at their original size are dropped after scaling.
+
+        Parameters:
+            path (str): The path to the folder containing image frames.
+            size (tuple): The size (width, height) of the scaled frames.
+            convert (bool, optional): Converts the frames to the display format if True. Defaults to True.
+
+        Returns:
+            frames (tuple): A tuple of pygame.Surface objects representing the scaled frames.
+        """
+        key = (path, size, convert)
+        if key in self.scaled_folders:
+            return self.scaled_folders[key]
+
+        frames = []
+        for img_file in sorted(os.listdir(path)):
+            self.disk_loads += 1
+            frame = pygame.transform.scale(pygame.image.load(path + "/" + img_file), size)
+            if convert and self.display_ready():
+                frame = frame.convert_alpha() if self.has_alpha(frame) else frame.convert()
+            frames.append(frame)
+
+        frames = tuple(frames)
+        if not convert or self.display_ready():
+            self.scaled_folders[key] = frames
+        return frames
+
+    def character_states(self, path, colorkey=None):
+        """
+        Returns the character states (animations) found in the given root folder, in sorted name order (the forms,
+        the moves and the frames of every move).
+        - Like the folders, the states are only cached once the display exists, so unconverted frames aren't kept.
+
+        Parameters:
+            path (str): The path to the root folder containing character state animations.
+            colorkey (tuple, optional): The colorkey applied to the frames. Defaults to None.
+
+        Returns:
+            states (dict): A dictionary containing character states, organized by form and movement.
+        """
+        key = (path, colorkey)
+        if key in self.states:
+            return self.states[key]
+
+        states = {}
+        for forms in sorted(os.listdir(path)):
+            states[forms] = {}
+            for moves in sorted(os.listdir(path + forms + "/")):
+                move_path = path + forms + "/" + moves + "/"
+                frames = []
+                for _, __, img_files in os.walk(move_path):
+                    for img in sorted(img_files):
+                        frames.append(self.image(move_path + img, colorkey))
+                states[forms][moves] = tuple(frames)
+
+        if self.display_ready():
+            self.states[key] = states
+        return states
+
+    def font(self, path, size):
+        """
+        Returns the shared font of the given size.
+
+        Parameters:
+            path (str): The path to the font file.
+            size (int): The size of the font.
+
+        Returns:
+            font (pygame.font.Font): The shared font.
+        """
+        key = (path, size)
+        if key not in self.fonts:
+            self.disk_loads += 1
+            self.fonts[key] = pygame.font.Font(path, size)
+        return self.fonts[key]
+
+    def flipped(self, frame):
+        """
+        Returns the horizontally mirrored variant of a frame, mirroring it on the first request.
+
+        Parameters:
+            frame (pygame.Surface): The source frame.
+
+        Returns:
+            surface (pygame.Surface): The mirrored frame, with the colorkey of the source frame.
+        """
+        if frame not in self.flips:
+            self.flips[frame] = pygame.transform.flip(frame, True, False)
+        return self.flips[frame]
+
+    def rotated(self, frame, angle):
+        """
+        Returns a frame rotated counterclockwise by the given angle, quantized to the steps of the rotation table.
+        - The whole rotation table of the frame is computed on the first request, every frame is rotated from the
+          source frame, so the quality doesn't degrade.
+
+        Parameters:
+            frame (pygame.Surface): The source frame.
+            angle (float): The angle of the rotation in degrees.
+
+        Returns:
+            surface (pygame.Surface): The rotated frame.
+        """
+        table = self.rotations.get(frame)
+        if table is None:
+            table = tuple(
+                pygame.transform.rotate(frame, step * 360 / rotation_steps)
+                for step in range(rotation_steps)
+            )
+            self.rotations[frame] = table
+        return table[round(angle * rotation_steps / 360) % rotation_steps]
+
+    def faded(self, frame, alpha):
+        """
+        Returns a translucent variant of a frame, leaving the shared source frame untouched.
+
+        Parameters:
+            frame (pygame.Surface): The source frame.
+            alpha (int): The alpha of the variant, from 0 (invisible) to 255 (opaque).
+
+        Returns:
+            surface (pygame.Surface): The translucent frame, or the source frame itself if alpha is 255.
+        """
+        if alpha >= 255:
+            return frame
+
+        key = (frame, alpha)
+        if key not in self.fades:
+            surface = frame.copy()
+            surface.set_alpha(alpha)
+            self.fades[key] = surface
+        return self.fades[key]
+
+    def mask(self, frame):
+        """
+        Returns the collision mask of a frame, computing it on the first request.
+        - The opaque pixels are set, the colorkey (or the alpha of per-pixel alpha frames) makes the others unset.
+
+        Parameters:
+            frame (pygame.Surface): The frame, as drawn (e.g. the mirrored or rotated variant).
+
+        Returns:
+            mask (pygame.mask.Mask): The mask of the frame.
+        """
+        mask = self.masks.get(frame)
+        if mask is None:
+            mask = pygame.mask.from_surface(frame)
+            self.masks[frame] = mask
+        return mask
+
+    def prepare_masks(self, frames):
+        """Computes the masks of frames and of their mirrored variants up front, e.g. when a level is loaded."""
+        for frame in frames:
+            self.mask(frame)
+            self.mask(self.flipped(frame))
+
+    def preload(self, scene):
+        """
+        Loads every asset listed in the manifest of the given scene.
+
+        Parameters:
+            scene (str or int): "menu", "overworld", or the number of a level in game_data.levels.
+        """
+        from support import import_cut_graphics
+
+        for kind, *args in scene_manifests[scene]:
+            if kind == "image":
+                self.image(*args)
+            elif kind == "folder":
+                self.folder(*args)
+            elif kind == "scaled_folder":
+                self.scaled_folder(*args)
+            elif kind == "states":
+                self.character_states(*args)
+            elif kind == "font":
+                self.font(*args)
+            elif kind == "sheet":
+                import_cut_graphics(*args)
+
+
+# The process-wide registry, every module loads its assets through this instance.
+registry = AssetRegistry()
+
+font_path = "../Packages/Fonts/Super-Mario-Bros.ttf"
+colorkey = (0, 0, 0)
+
+# Assets shown in every scene with a HUD.
+hud_manifest = [
+    ("font", font_path, 40),
+    ("image", "../Packages/UI/head_icon.png", colorkey),
+    ("image", "../Packages/Textures/map/objects/coin.png", colorkey),
+]
+
+# Assets used by every level.
+level_manifest = hud_manifest + [
+    (
+        "sheet",
+        "../Packages/Textures/map/blocks/static/super_mario_bros__tile_revamp_by_malice936_d5ik1aw_scaled_4x_pngcrushed (1).png",
+        "terrain",
+    ),
+    ("sheet", "../Packages/Textures/map/blocks/static/castle.png", "goal"),
+    ("sheet", "../Packages/Textures/map/blocks/animated/question-block.png", "coin-block"),
+    ("sheet", "../Packages/Textures/map/enemies/enemies.png", "enemy"),
+    ("image", "../Packages/Textures/map/blocks/static/empty_question_block.png", colorkey),
+    ("image", "../Packages/Textures/map/decor/bush.png"),
+    ("image", "../Packages/Textures/map/decor/cloud.png"),
+    ("image", "../Packages/Textures/map/objects/mushroom.png", colorkey),
+    ("image", "../Packages/Textures/map/objects/fire-flower.png", colorkey),
+    ("states", "../Packages/Textures/player/mario/", colorkey),
+    ("folder", "../Packages/Textures/particles/", colorkey),
+]
+
+# Assets used by the levels with a boss fight.
+boss_manifest = [
+    ("states", "../Packages/Textures/map/enemies/boss/boss/", colorkey),
+    ("image", "../Packages/Textures/map/enemies/boss/mecha_boss_fire.png", colorkey),
+    ("image", "../Packages/Textures/map/enemies/boss/pow.jpg", colorkey),
+]
+
+# The preload manifest of every scene.
+scene_manifests = {
+    "menu": [
+        ("font", font_path, 40),
+        ("scaled_folder", "../Menu/monitor_frames", (190, 165)),
+        ("image", "../Menu/controls.png"),
+        ("image", "../Menu/menu_title.png"),
+    ],
+    "overworld": hud_manifest
+    + [
+        ("folder", "../OverWorld/OverworldMap"),
+        ("image", "../OverWorld/overworld_controls.png"),
+        ("image", "../Packages/Textures/player/mario/small/idle/mario.png", colorkey),
+    ],
+}
+for level_number, level_data in levels.items():
+    scene_manifests[level_number] = level_manifest + (
+        boss_manifest if level_data.get("boss") else []
+    )
@@ -1,5 +1,7 @@
 import pygame
 from support import import_states
+from assets import registry
+from lifecycle import LIVING, DYING
 import random
 
 
@@ -32,8 +34,10 @@ class Boss(pygame.sprite.Sprite):
 
         - Boss status
             dispaly_surface: The surface on which the boss is displayed.
+            camera: The camera of the level, used to draw the effects at their screen position.
             lives: The number of lives the boss has.
             alive: A boolean flag indicating if the boss is alive.
+            life: The lifecycle state of the boss, dying while it falls out of the screen (see lifecycle.py).
             status: The move status of the boss
             form: The form of the boss (right now there is only "mecha" form)
             position: A vector representing the boss's position.
@@ -55,15 +59,16 @@ class Boss(pygame.sprite.Sprite):
         - animate(self)
         - move(self)
         - attack_particles(self)
+        - wake(self)
         - set_status(self, status)
         - bump(self)
         - get_status(self)
         - apply_gravity(self)
-        - update(self, shift)
+        - update(self)
 
     """
 
-    def __init__(self, pos, surface):
+    def __init__(self, pos, surface, camera):
         super().__init__()
 
         # Boss animation
@@ -86,23 +91,23 @@ class Boss(pygame.sprite.Sprite):
 
         # Boss Status
         self.dispaly_surface = surface
+        self.camera = camera
         self.lives = 3
         self.alive = True
+        self.life = LIVING
         self.status = "idle"
         self.form = "mecha"
         self.position = pygame.math.Vector2(pos[0], pos[1])
 
         # Particles
-        self.fire_ball = pygame.image.load(
-            "../Packages/Textures/map/enemies/boss/mecha_boss_fire.png"
+        self.fire_ball = registry.image(
+            "../Packages/Textures/map/enemies/boss/mecha_boss_fire.png", (0, 0, 0)
         )
-        self.fire_ball.set_colorkey((0, 0, 0))
         self.fire_ball_speed = 8
         self.particle_pos = [0, 0]
-        self.pow_effect = pygame.image.load(
-            "../Packages/Textures/map/enemies/boss/pow.jpg"
+        self.pow_effect = registry.image(
+            "../Packages/Textures/map/enemies/boss/pow.jpg", (0, 0, 0)
         )
-        self.pow_effect.set_colorkey((0, 0, 0))
 
         # Initializing boss assets
         self.import_character_asstes()
@@ -114,7 +119,7 @@ class Boss(pygame.sprite.Sprite):
         Imports the boss's animation_frames for different forms and statuses.
         """
         character_path = "../Packages/Textures/map/enemies/boss/boss/"
-        self.forms = import_states(character_path)
+        self.forms = import_states(character_path, (0, 0, 0))
 
     def animate(self):
         """
@@ -122,8 +127,9 @@ class Boss(pygame.sprite.Sprite):
 
         - The method handles the boss's animation by incrementing the frame index based on the animation speed.
         - If the frame index exceeds the total number of animation frames, it is reset to 0 to loop the animation.
-        - The boss's image is updated with the current frame, and the colorkey is set to make the background transparent.
-        - If the boss's lives reach 0, it initiates the 'die' movement.
+        - The boss's image is updated with the current frame, the frames are loaded with a colorkey to make the
+          background transparent.
+        - If the boss's lives reach 0, it initiates the 'die' movement, and it's dying until it leaves the world.
 
         Args:
             self (Boss): The instance of the boss object.
@@ -138,10 +144,10 @@ class Boss(pygame.sprite.Sprite):
             self.frame_index = 0
 
         self.image = animation[int(self.frame_index)]
-        self.image.set_colorkey((0, 0, 0))
 
         if self.lives <= 0:
             BossMovements.die(self)
+            self.life = DYING
 
     def move(self):
         """
@@ -178,7 +184,8 @@ class Boss(pygame.sprite.Sprite):
 
         if self.damaged and tick < self.last_damage_taken + 1000:
             self.dispaly_surface.blit(
-                self.pow_effect, (self.rect.left, self.rect.top - 50)
+                self.pow_effect,
+                self.camera.to_screen((self.rect.left, self.rect.top - 50)),
             )
 
     def attack_particles(self):
@@ -187,12 +194,23 @@ class Boss(pygame.sprite.Sprite):
         - It then displays the fire ball particles on the display surface at the updated position.
 
         Returns:
-            List[int, int]: The updated particle position as a list of [x, y] coordinates.
+            List[int, int]: The updated particle position as a list of [x, y] world coordinates.
         """
         self.particle_pos[0] -= self.fire_ball_speed
-        self.dispaly_surface.blit(self.fire_ball, self.particle_pos)
+        self.dispaly_surface.blit(
+            self.fire_ball, self.camera.to_screen(self.particle_pos)
+        )
         return self.particle_pos
 
+    def wake(self):
+        """
+        Wakes the boss up, when the player reaches its arena.
+        - The timers of the jumps and attacks start now, so the boss doesn't act on the time spent dormant.
+        """
+        tick = pygame.time.get_ticks()
+        self.last_jump_time = tick
+        self.last_attack_time = tick
+
     def set_status(self, status):
         """ """
         self.status = status
@@ -227,21 +245,29 @@ class Boss(pygame.sprite.Sprite):
         """
         return self.status, self.form
 
-    def apply_gravity(self):
+    def apply_gravity(self, dt=1):
         """
         - Applies gravity to the boss's vertical movement.
         - The method efficiently updates the boss's y-direction by adding the gravity value to it, which simulates the effect
-        - of gravity on the boss's movement. It then updates the boss's vertical position accordingly.
+        - of gravity on the boss's movement.
+        - The move over dt frames is the sum of dt single-frame steps (speed += gravity, then move by the speed), so the
+          jump height and the fall don't depend on the time step.
+        - The boss isn't moved here, the level sweeps the move against the tiles (see Level.boss_player_collisions).
+
+        Parameters:
+            dt (float, optional): The number of frames simulated. Defaults to 1.
+
+        Returns:
+            float: The vertical move of the boss in pixels.
         """
-        self.direction.y += self.gravity
-        self.rect.y += self.direction.y
+        distance = self.direction.y * dt + self.gravity * dt * (dt + 1) / 2
+        self.direction.y += self.gravity * dt
+        return distance
 
-    def update(self, shift):
+    def update(self):
         """
         Runs all processes of the Boss class
         """
-        self.rect.x += shift
-        self.particle_pos[0] += shift
         if self.lives > 0:
             self.move()
         self.animate()
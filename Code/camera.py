@@ -0,0 +1,240 @@
+import pygame
+from collections import OrderedDict
+from settings import (
+    screen_width,
+    screen_height,
+    chunk_width,
+    view_margin,
+    baked_chunk_size,
+    baked_chunk_limit,
+)
+
+
+class Camera:
+    """
+    Represents the view of the level.
+
+    - Sprites keep their position in world coordinates, the camera only holds the horizontal offset of the view.
+    - The offset is applied when a sprite is drawn, so scrolling doesn't move any sprite.
+
+    Attributes:
+        x (int): The world x-coordinate of the left edge of the view.
+        width (int): The width of the view in pixels.
+        height (int): The height of the view in pixels.
+
+    Methods:
+        - scroll(amount)
+        - view()
+        - to_screen(pos)
+        - draw(sprites, surface)
+    """
+
+    def __init__(self, width=screen_width, height=screen_height):
+        self.x = 0
+        self.width = width
+        self.height = height
+
+    def scroll(self, amount):
+        """Moves the view horizontally by the given amount of pixels."""
+        self.x += amount
+
+    def view(self):
+        """Returns the area of the world that is visible, as a pygame.Rect in world coordinates."""
+        return pygame.Rect(self.x, 0, self.width, self.height)
+
+    def to_screen(self, pos):
+        """Returns the screen position of a point given in world coordinates."""
+        return pos[0] - self.x, pos[1]
+
+    def draw(self, sprites, surface):
+        """
+        Draws the visible sprites at their screen position.
+
+        Parameters:
+            sprites (iterable): The sprites to draw, with their rect in world coordinates.
+            surface (pygame.Surface): The surface to draw upon.
+        """
+        for sprite in sprites:
+            x = sprite.rect.x - self.x
+            if -sprite.image.get_width() < x < self.width:
+                surface.blit(sprite.image, (x, sprite.rect.y))
+
+
+class ChunkedGroup(pygame.sprite.Group):
+    """
+    A sprite group that buckets its sprites into fixed-width column chunks of the level.
+
+    - Sprites are bucketed by the x-coordinate of their rect, when they are added to the group.
+    - Only the chunks overlapping the view (plus a margin) are updated and drawn, so the work per frame is bounded by the
+      size of the screen, instead of the length of the level.
+    - Sprites moving to another chunk during their update are moved to that chunk's bucket.
+    - It's still a regular pygame group, collision checks against the whole group keep working.
+
+    Attributes:
+        chunk_width (int): The width of a chunk in pixels.
+        margin (int): The extra distance around the view, where sprites are still visible.
+        chunks (dict): The buckets of sprites by chunk index.
+        sprite_chunks (dict): The chunk index of every sprite.
+        visible_count (int): The number of sprites near the view during the last update or draw.
+
+    Methods:
+        - visible_sprites(camera)
+        - update_visible(camera, *args)
+        - draw_visible(camera, surface)
+    """
+
+    def __init__(self, *sprites, chunk_width=chunk_width, margin=view_margin):
+        self.chunk_width = chunk_width
+        self.margin = margin
+        self.chunks = {}
+        self.sprite_chunks = {}
+        self.visible_count = 0
+        super().__init__(*sprites)
+
+    def add_internal(self, sprite, layer=None):
+        """Adds the sprite to the group, and to the bucket of its chunk."""
+        super().add_internal(sprite, layer)
+        self.bucket(sprite, sprite.rect.x // self.chunk_width)
+
+    def remove_internal(self, sprite):
+        """Removes the sprite from the group, and from the bucket of its chunk."""
+        super().remove_internal(sprite)
+        chunk = self.sprite_chunks.pop(sprite, None)
+        if chunk is not None:
+            del self.chunks[chunk][sprite]
+
+    def bucket(self, sprite, chunk):
+        """Puts the sprite into the bucket of the given chunk."""
+        self.sprite_chunks[sprite] = chunk
+        self.chunks.setdefault(chunk, {})[sprite] = None
+
+    def visible_sprites(self, camera):
+        """
+        Returns the sprites of the chunks overlapping the view of the camera, including the margin.
+
+        Parameters:
+            camera (Camera): The camera of the level.
+
+        Returns:
+            sprites (list): The sprites near the view.
+        """
+        first = (camera.x - self.margin) // self.chunk_width
+        last = (camera.x + camera.width + self.margin) // self.chunk_width
+
+        sprites = []
+        for chunk in range(first, last + 1):
+            if chunk in self.chunks:
+                sprites.extend(self.chunks[chunk])
+
+        self.visible_count = len(sprites)
+        return sprites
+
+    def update_visible(self, camera, *args):
+        """
+        Updates the sprites near the view, and moves them to another bucket if they left their chunk.
+
+        Parameters:
+            camera (Camera): The camera of the level.
+            args: The arguments passed to the update of every sprite.
+        """
+        for sprite in self.visible_sprites(camera):
+            sprite.update(*args)
+            chunk = sprite.rect.x // self.chunk_width
+            if chunk != self.sprite_chunks.get(sprite, chunk):
+                del self.chunks[self.sprite_chunks[sprite]][sprite]
+                self.bucket(sprite, chunk)
+
+    def draw_visible(self, camera, surface):
+        """
+        Draws the sprites near the view.
+
+        Parameters:
+            camera (Camera): The camera of the level.
+            surface (pygame.Surface): The surface to draw upon.
+        """
+        camera.draw(self.visible_sprites(camera), surface)
+
+
+class BakedLayer:
+    """
+    Pre-renders static tile layers into large chunk surfaces.
+
+    - Every chunk is baked the first time it becomes visible, drawing the layers costs a few large blits per frame,
+      instead of one blit per tile.
+    - The chunks are rendered straight from the tile arrays of the layers (see TileMap.draw_area).
+    - If a tile of a layer changes, invalidate() drops the chunks under it, they are baked again when drawn.
+    - Only the most recently drawn chunks are kept, so long levels don't keep every chunk in memory.
+    - Layers with per-pixel alpha textures are baked into alpha surfaces, other layers into colorkeyed surfaces,
+      which are faster to blit.
+
+    Attributes:
+        layers (tuple): The TileMaps baked into the chunks, in drawing order.
+        chunk_width (int): The width of a chunk in pixels.
+        chunk_height (int): The height of a chunk in pixels.
+        chunk_count (int): The number of chunks covering the layers.
+        max_chunks (int): The number of baked chunks kept in memory.
+        surfaces (OrderedDict): The baked chunk surfaces, the least recently drawn first.
+        alpha (bool): True if the layers are baked into alpha surfaces.
+
+    Methods:
+        - invalidate(rect)
+        - draw(camera, surface)
+    """
+
+    def __init__(self, *layers, chunk_size=baked_chunk_size, max_chunks=baked_chunk_limit):
+        self.layers = layers
+        self.chunk_width, self.chunk_height = chunk_size
+        self.max_chunks = max_chunks
+        self.surfaces = OrderedDict()
+
+        level_width = max(layer.width * layer.cell_size for layer in layers)
+        self.chunk_count = -(-level_width // self.chunk_width)
+        self.alpha = any(
+            texture.get_flags() & pygame.SRCALPHA
+            for layer in layers
+            for texture in layer.textures
+            if texture is not None
+        )
+
+    def bake(self, chunk):
+        """Renders the tiles of a chunk into a new surface."""
+        if self.alpha:
+            surface = pygame.Surface(
+                (self.chunk_width, self.chunk_height), pygame.SRCALPHA
+            )
+        else:
+            surface = pygame.Surface((self.chunk_width, self.chunk_height))
+            surface.set_colorkey((0, 0, 0), pygame.RLEACCEL)
+
+        area = pygame.Rect(chunk * self.chunk_width, 0, self.chunk_width, self.chunk_height)
+        for layer in self.layers:
+            layer.draw_area(surface, area)
+        return surface
+
+    def invalidate(self, rect):
+        """Drops the baked chunks overlapping the given rect (in world coordinates)."""
+        left = rect.left // self.chunk_width
+        right = (rect.right - 1) // self.chunk_width
+        for chunk in range(left, right + 1):
+            self.surfaces.pop(chunk, None)
+
+    def draw(self, camera, surface):
+        """
+        Draws the chunks visible by the camera, baking the ones that aren't baked yet.
+
+        Parameters:
+            camera (Camera): The camera of the level.
+            surface (pygame.Surface): The surface to draw upon.
+        """
+        first = max(camera.x // self.chunk_width, 0)
+        last = min((camera.x + camera.width - 1) // self.chunk_width, self.chunk_count - 1)
+
+        for chunk in range(first, last + 1):
+            if chunk in self.surfaces:
+                self.surfaces.move_to_end(chunk)
+            else:
+                self.surfaces[chunk] = self.bake(chunk)
+                if len(self.surfaces) > self.max_chunks:
+                    self.surfaces.popitem(last=False)
+
+            surface.blit(self.surfaces[chunk], (chunk * self.chunk_width - camera.x, 0))
@@ -0,0 +1,323 @@
+import math
+import numpy as np
+from settings import tile_size, sweep_skin
+
+# The kinds of boxes in the broadphase of the moving entities.
+ENEMY = 0
+BOSS = 1
+FIREBALL = 2
+POWER_UP = 3
+
+
+def pixel_step(distance):
+    """Rounds a move to whole pixels, the way pygame.Rect rounds a float coordinate (halves are rounded up)."""
+    return math.floor(distance + 0.5)
+
+
+def sweep(rect, distance, axis, tiles, skin=sweep_skin):
+    """
+    Swept AABB test of a rect moving along one axis, against the solid tiles in its path.
+
+    - The path of the move is the union of the rect before and after the move, the tiles in it are the candidates.
+    - The time of impact with a tile is when the rect touches it, the earliest one cuts the move short.
+    - The rect is left overlapping the tile it hit by up to skin pixels, so the overlap resolution that follows the move
+      still sees the hit (landing, bumping a block), and pushes the rect back out.
+      Moves that end less than skin pixels into a tile aren't changed, only moves that would pass through one.
+    - Tiles the rect already overlaps before the move are left to the overlap resolution.
+
+    Parameters:
+        rect (pygame.Rect): The rect before the move, in world coordinates.
+        distance (int): The length of the move in pixels, negative when moving left or up.
+        axis (int): 0 for a horizontal move, 1 for a vertical move.
+        tiles (function): Returns the solid tiles colliding with a rect (e.g. Level.solid_tiles).
+        skin (int, optional): The deepest overlap the move can end in. Defaults to settings.sweep_skin.
+
+    Returns:
+        distance (int): The length of the move, cut at the first tile in the path.
+    """
+    if not distance:
+        return 0
+    path = rect.union(rect.move((distance, 0) if axis == 0 else (0, distance)))
+
+    impact = None
+    for tile in tiles(path):
+        if axis == 0:
+            gap = tile.rect.left - rect.right if distance > 0 else rect.left - tile.rect.right
+        else:
+            gap = tile.rect.top - rect.bottom if distance > 0 else rect.top - tile.rect.bottom
+        if gap >= 0 and (impact is None or gap < impact):
+            impact = gap
+
+    if impact is None or abs(distance) <= impact + skin:
+        return distance
+    return impact + skin if distance > 0 else -(impact + skin)
+
+
+class TileGrid:
+    """
+    Spatial index of tile sprites, on a uniform grid of the tile size.
+
+    - Every sprite is indexed in the cells its rect overlaps, so finding the sprites under a rect only looks at the
+      cells it touches, instead of every sprite of the level.
+    - Collisions are returned in the order the sprites were added, so resolving them gives the same result as looping
+      over the whole list of sprites.
+    - A sprite that moves (e.g. a bumped block) is re-indexed with move(), only the cells it left or entered change.
+
+    Attributes:
+        cell_size (int): The width and height of a cell in pixels.
+        cells (dict): The sprites indexed in every cell, keyed by (column, row).
+        sprite_cells (dict): The range of cells (first column, last column, first row, last row) of every sprite.
+        order (dict): The order every sprite was added in.
+
+    Methods:
+        - add(sprite)
+        - remove(sprite)
+        - move(sprite)
+        - collide(rect)
+    """
+
+    def __init__(self, *groups, cell_size=tile_size):
+        self.cell_size = cell_size
+        self.cells = {}
+        self.sprite_cells = {}
+        self.order = {}
+
+        for group in groups:
+            for sprite in group:
+                self.add(sprite)
+
+    def __len__(self):
+        return len(self.sprite_cells)
+
+    def __contains__(self, sprite):
+        return sprite in self.sprite_cells
+
+    def cell_range(self, rect):
+        """Returns the range of cells (first column, last column, first row, last row) overlapped by a rect."""
+        size = self.cell_size
+        return (
+            rect.left // size,
+            (rect.right - 1) // size,
+            rect.top // size,
+            (rect.bottom - 1) // size,
+        )
+
+    @staticmethod
+    def cells_of(cell_range):
+        """Returns the set of (column, row) cells in a range of cells."""
+        first_column, last_column, first_row, last_row = cell_range
+        return {
+            (column, row)
+            for column in range(first_column, last_column + 1)
+            for row in range(first_row, last_row + 1)
+        }
+
+    def add(self, sprite):
+        """Indexes a sprite in the cells its rect overlaps."""
+        if sprite in self.sprite_cells:
+            return
+        self.order[sprite] = len(self.order)
+        cell_range = self.cell_range(sprite.rect)
+        self.sprite_cells[sprite] = cell_range
+        for cell in self.cells_of(cell_range):
+            self.cells.setdefault(cell, {})[sprite] = None
+
+    def remove(self, sprite):
+        """Removes a sprite from the index."""
+        cell_range = self.sprite_cells.pop(sprite, None)
+        if cell_range is None:
+            return
+        del self.order[sprite]
+        for cell in self.cells_of(cell_range):
+            del self.cells[cell][sprite]
+
+    def move(self, sprite):
+        """Re-indexes a sprite after its rect changed, updating only the cells it left or entered."""
+        old_range = self.sprite_cells[sprite]
+        new_range = self.cell_range(sprite.rect)
+        if new_range == old_range:
+            return
+
+        old_cells = self.cells_of(old_range)
+        new_cells = self.cells_of(new_range)
+        for cell in old_cells - new_cells:
+            del self.cells[cell][sprite]
+        for cell in new_cells - old_cells:
+            self.cells.setdefault(cell, {})[sprite] = None
+        self.sprite_cells[sprite] = new_range
+
+    def collide(self, rect):
+        """
+        Finds the sprites colliding with a rect.
+
+        Parameters:
+            rect (pygame.Rect): The rect to check, in world coordinates.
+
+        Returns:
+            sprites (list): The colliding sprites, in the order they were added to the index.
+        """
+        first_column, last_column, first_row, last_row = self.cell_range(rect)
+        cells = self.cells
+
+        found = {}
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                cell = cells.get((column, row))
+                if cell:
+                    for sprite in cell:
+                        if sprite.rect.colliderect(rect):
+                            found[sprite] = None
+
+        if len(found) > 1:
+            return sorted(found, key=self.order.__getitem__)
+        return list(found)
+
+
+class SweepAndPrune:
+    """
+    Broadphase of the moving entities (enemies, the boss, fireballs, power ups), sweep and prune on the x-axis.
+
+    - The levels are a horizontal strip, so the boxes are only sorted by their left edge. A rect can only overlap the
+      boxes whose left edge is between its own left edge minus the widest box, and its right edge, so the candidates of
+      a rect are found with a binary search, and only the boxes near it are tested.
+    - Every box (proxy) has a kind (ENEMY, BOSS, ...) and an owner, the index of its entity within its kind
+      (e.g. the index of an enemy in the EnemySwarm).
+    - Moving boxes only changes their edges. The order of the last query is sorted again before the next one, it's
+      nearly sorted already, so the stable sort (a timsort over the sorted runs) is close to linear.
+
+    Attributes:
+        left, top, right, bottom (array): The edges of the boxes, in world coordinates.
+        kind (array): The kind of the boxes, -1 for the free proxies.
+        owner (array): The index of the entity of the boxes, within their kind.
+        order (array): The proxies in use, sorted by their left edge when the boxes last changed.
+        sorted_left (array): The left edges of the boxes, in that order.
+        widest (int): The width of the widest box.
+        free (list): The free proxies, reused by the next boxes.
+        changed (bool): True if the boxes changed since they were last sorted.
+
+    Methods:
+        - add(kind, owner, rect)
+        - add_many(kind, owners, x, y, width, height)
+        - remove(proxy)
+        - remove_many(proxies)
+        - move(proxy, rect)
+        - move_many(proxies, x, y, width, height)
+        - query(rect, kind)
+    """
+
+    fields = ("left", "top", "right", "bottom", "kind", "owner")
+
+    def __init__(self, capacity=64):
+        for name in self.fields:
+            setattr(self, name, np.zeros(capacity, dtype=np.int64))
+        self.kind[:] = -1
+        self.order = np.zeros(0, dtype=np.int64)
+        self.sorted_left = np.zeros(0, dtype=np.int64)
+        self.widest = 0
+        self.free = list(range(capacity - 1, -1, -1))
+        self.changed = False
+
+    def __len__(self):
+        return len(self.order)
+
+    def allocate(self, count):
+        """Returns count free proxies, growing the arrays as needed."""
+        while len(self.free) < count:
+            capacity = len(self.left)
+            for name in self.fields:
+                array = getattr(self, name)
+                setattr(self, name, np.concatenate((array, np.zeros_like(array))))
+            self.kind[capacity:] = -1
+            self.free[:0] = range(2 * capacity - 1, capacity - 1, -1)
+        proxies = self.free[len(self.free) - count :]
+        del self.free[len(self.free) - count :]
+        return np.array(proxies, dtype=np.int64)
+
+    def add(self, kind, owner, rect):
+        """Adds a box, and returns its proxy."""
+        return int(self.add_many(kind, [owner], rect.x, rect.y, rect.width, rect.height)[0])
+
+    def add_many(self, kind, owners, x, y, width, height):
+        """
+        Adds boxes of the same kind.
+
+        Parameters:
+            kind (int): The kind of the boxes.
+            owners (array): The index of the entity of every box.
+            x, y, width, height (array or int): The boxes, in world coordinates.
+
+        Returns:
+            proxies (array): The proxies of the new boxes.
+        """
+        proxies = self.allocate(len(owners))
+        self.kind[proxies] = kind
+        self.owner[proxies] = owners
+        self.order = np.concatenate((self.order, proxies))
+        self.move_many(proxies, x, y, width, height)
+        return proxies
+
+    def remove(self, proxy):
+        """Removes a box."""
+        self.remove_many(np.array([proxy], dtype=np.int64))
+
+    def remove_many(self, proxies):
+        """Removes boxes, their proxies are reused by the next boxes."""
+        self.kind[proxies] = -1
+        self.order = self.order[self.kind[self.order] != -1]
+        self.sorted_left = self.left[self.order]
+        self.free.extend(proxies.tolist())
+
+    def move(self, proxy, rect):
+        """Moves a box to a rect."""
+        self.left[proxy] = rect.left
+        self.top[proxy] = rect.top
+        self.right[proxy] = rect.right
+        self.bottom[proxy] = rect.bottom
+        self.changed = True
+
+    def move_many(self, proxies, x, y, width, height):
+        """Moves boxes, given as arrays of their top left corner and size."""
+        self.left[proxies] = x
+        self.top[proxies] = y
+        self.right[proxies] = self.left[proxies] + width
+        self.bottom[proxies] = self.top[proxies] + height
+        self.changed = True
+
+    def sort(self):
+        """Sorts the boxes by their left edge again, starting from their previous order."""
+        order = self.order
+        order = order[np.argsort(self.left[order], kind="stable")]
+        self.order = order
+        self.sorted_left = self.left[order]
+        self.widest = int((self.right[order] - self.sorted_left).max(initial=0))
+        self.changed = False
+
+    def query(self, rect, kind):
+        """
+        Finds the boxes of a kind overlapping a rect, the candidate pairs of the rect and the entities of that kind.
+        - Boxes without an area never overlap, like pygame.Rect.
+
+        Parameters:
+            rect (pygame.Rect): The rect to check, in world coordinates.
+            kind (int): The kind of the boxes to find.
+
+        Returns:
+            owners (array): The owners of the overlapping boxes, sorted.
+        """
+        if self.changed:
+            self.sort()
+        first = np.searchsorted(self.sorted_left, rect.left - self.widest, side="right")
+        last = np.searchsorted(self.sorted_left, rect.right, side="left")
+        candidates = self.order[first:last]
+
+        left, right = self.left[candidates], self.right[candidates]
+        top, bottom = self.top[candidates], self.bottom[candidates]
+        hits = (
+            (self.kind[candidates] == kind)
+            & (left < right)
+            & (top < bottom)
+            & (right > rect.left)
+            & (top < rect.bottom)
+            & (bottom > rect.top)
+        )
+        return np.sort(self.owner[candidates[hits]])
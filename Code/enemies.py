@@ -1,134 +1,519 @@
-import pygame
-from tiles import AnimatedTile
+import numpy as np
 from random import randint
+from support import import_cut_graphics
+from assets import registry
+from collision import SweepAndPrune, ENEMY
+from lifecycle import LIVING, DYING, DEAD
+from settings import wake_distance, sleep_distance, squash_time, screen_height
 
+# The states of an enemy.
+ALIVE = 0
+STUNNED = 1
+STUMPED = 2
+BURNED = 3
 
-class Enemy(AnimatedTile):
+state_names = {ALIVE: "alive", STUNNED: "stunned", STUMPED: "stumped", BURNED: "burned"}
+
+# The simulation levels of an enemy.
+DORMANT = 0
+ACTIVE = 1
+DESPAWNED = 2
+
+# The patrol bounds of the enemies without a constrain or wall on that side.
+no_limit_left = np.iinfo(np.int64).min
+no_limit_right = np.iinfo(np.int64).max
+
+
+class EnemySwarm:
     """
-    Represents an enemy entity in the game.
+    Represents every enemy of a level, simulated together on NumPy arrays (one array per attribute).
+
+    - An enemy is an index into the arrays, instead of a sprite object, so moving, animating and testing thousands of
+      enemies is a handful of array operations per frame.
+    - The enemy types of settings.enemy_specifications are mapped onto the arrays by add().
+    - Enemies are dormant until the view comes within the wake distance, only the active enemies are moved, tested
+      and drawn, so the cost of a frame scales with the enemies near the player, not with the size of the level.
+    - Active enemies farther than the sleep distance are put back to sleep, dying ones are despawned for good.
+    - Every enemy has a lifecycle (see lifecycle.py): living, dying while its death animation plays (squashed for
+      settings.squash_time frames, or burned until it falls out of the world), then dead. Dead enemies, and enemies
+      that left the world bounds, are reaped at the end of every update, they are no longer moved, tested or drawn.
+    - Drawing is the only per-enemy loop, it only runs over the active enemies, and blits them in one batch.
+    - The active enemies have a box in the broadphase (SweepAndPrune) of the level, collisions only test the enemies
+      near the rect, however many enemies are active.
 
-    This class extends the AnimatedTile class and manages the behavior and attributes of an enemy character in the game.
-    The enemy can move, change direction, get stunned, and be burned. It has animation frames for various states.
+    The enemies can move, change direction, get stunned, stumped (jumped on) and burned:
+        - alive: walks, and turns around at the ends of its patrol interval (the nearest constrain or wall).
+        - stunned: bounces up while spinning, then walks again.
+        - stumped: squashed, it stays in place with the squashed animation, then it's removed.
+        - burned: spins and falls off the screen, then it's removed.
 
     Attributes:
-        - speed: The speed at which the enemy moves.
-        - state: The current state of the enemy (e.g., "alive", "stunned", "burned").
-        - bounce_height: The height of the bounce when the enemy is stunned or burned.
-        - rotation_angle: The angle of rotation when the enemy is stunned or burned.
-        - y: The initial vertical position of the enemy.
+        frames (tuple): The frames of every enemy type, cut from the enemy sheet.
+        count (int): The number of enemies.
+        x, y (array): The position of the top left corner of the enemies, in world coordinates.
+        width, height (array): The size of the hitbox of the enemies (0 once they are dead).
+        home_y (array): The vertical position the enemies stand at, before any bounce.
+        speed (array): The horizontal speed of the enemies, negative when walking left.
+        state (array): The state of the enemies (ALIVE, STUNNED, STUMPED or BURNED).
+        alive (array): False once the enemies are stumped or burned.
+        bounce (array): The vertical speed of the bouncing enemies.
+        angle (array): The rotation angle of the bouncing enemies.
+        frame (array): The animation frame index of the enemies.
+        first_frame, frame_count (array): The animation of the enemies in the frames.
+        patrol_left, patrol_right (array): The world x-coordinates the enemies turn around at.
+        shown_frame, flipped, tilted, tilt (array): How the enemies look since their last update.
+        activity (array): The simulation level of the enemies (DORMANT, ACTIVE or DESPAWNED).
+        life (array): The lifecycle state of the enemies (LIVING, DYING or DEAD), dead enemies are despawned.
+        dying_time (array): The number of frames left of the death animation of the dying enemies (inf for the burned
+                            enemies, they die once they leave the world).
+        bounds (tuple): The left, top, right and bottom edges of the world, enemies whose top left corner leaves
+                        them are reaped.
+        active (array): The indices of the active enemies, in the order they were added.
+        dormant, dormant_x (array): The indices of the dormant enemies, and their x-coordinates, sorted by x.
+        wake_distance, sleep_distance (int): The distances from the view where enemies wake up and go to sleep.
+        visible_count (int): The number of active enemies.
+        broadphase (SweepAndPrune): The broadphase the active enemies are kept in.
+        proxy (array): The broadphase box of the active enemies.
 
     Methods:
-        - __init__(self, size, x, y, sprite_start_index, path, type, frame_count)
-        - move(self)
-        - reverse_image(self)
-        - reverse(self)
-        - stumped(self)
-        - stun(self)
-        - get_state(self)
-        - burn(self, direction)
-        - update(self, shift)
+        - add(specification, x, y)
+        - update_activity(camera)
+        - activity_counts()
+        - reap()
+        - collide(rect)
+        - collide_mask(rect, mask, pos)
+        - image(index)
+        - set_patrols(constrained, walls, cell_size)
+        - patrol()
+        - burn(indices, direction)
+        - stun(index)
+        - stumped(index)
+        - get_state(index)
+        - update(camera, dt=1)
+        - draw(camera, surface)
     """
 
-    def __init__(self, size, x, y, sprite_start_index, path, type, frame_count):
-        """Initializes an enemy with specified attributes."""
-        super().__init__(size, x, y, sprite_start_index, path, type, frame_count)
-        self.speed = randint(3, 5)
-        self.state = "alive"
-        self.bounce_height = -10
-        self.rotation_angle = 5
-        self.y = y
-
-    def move(self):
-        """
-        Moves the enemy horizontally and applies bouncing animations when stunned or burned.
-
-        Updates the enemy's horizontal position based on its current speed attribute.
-        If the enemy is in the "stunned" state, it performs a bouncing animation, then proceeds to walk.
-        If the enemy is in the "burned" state, it bounces and falls off screen..
-
-        Notes:
-            - The enemy's state can be "alive", "stunned", or "burned".
-            - The bounce_height attribute controls the height of the bounce during animations.
-            - The rotation_angle attribute controls the angle of rotation during animations.
-            - The self.y attribute stores the initial vertical position of the enemy before any bouncing animation.
-        """
-        self.rect.x += self.speed
-
-        if self.state == "stunned":
-            if self.rect.y < self.y:
-                self.rect.y += self.bounce_height
-                self.bounce_height += 0.3
-                self.image = pygame.transform.rotate(self.image, self.rotation_angle)
-                self.rotation_angle += 10
-            else:
-                self.rect.y = self.y
-                self.speed = 3
-                self.state = "alive"
-                self.bounce_height = -10
-                self.rotation_angle = 0
-
-        if self.state == "burned":
-            self.rect.y += self.bounce_height
-            self.bounce_height += 0.3
-            self.image = pygame.transform.rotate(self.image, self.rotation_angle)
-            self.rotation_angle += 10
-
-    def reverse_image(self):
-        """Reverses the enemy's image horizontally."""
-        if self.speed > 0:
-            self.image = pygame.transform.flip(self.image, True, False)
-
-    def reverse(self):
-        """Reverses the enemy's movement direction."""
-        self.speed *= -1
-
-    def stumped(self):
-        """
-        Transitions the enemy to the "stumped" state, disabling movement and rendering it inactive.
-        This method is called when the player jumps on the enemy.
-        """
-        if self.alive and self.state != "stunned":
-            self.start_frame_index += 2
-            self.frame_count = 1
-
-            self.state = "stumped"
-            self.rect.size = (0, 0)
-            self.alive = False
-
-    def stun(self):
-        """Stuns the enemy, rendering it temporarily immobile."""
-        if self.alive:
-            self.state = "stunned"
-            self.rect.y -= 5
-            self.speed = 0
-
-    def get_state(self):
-        """Returns the current state of the enemy."""
-        return self.state
-
-    def burn(self, direction):
-        """
-        Sets the enemy's status to "burned".
-        The enemy's vertical position, increases, and the image rotates slightly to simulate a bouncing motion.
-        Then the enemy falls off screen
+    int_fields = (
+        "x",
+        "y",
+        "width",
+        "height",
+        "home_y",
+        "speed",
+        "state",
+        "first_frame",
+        "frame_count",
+        "shown_frame",
+        "patrol_left",
+        "patrol_right",
+        "proxy",
+    )
+    float_fields = ("bounce", "angle", "frame", "tilt", "dying_time")
+    bool_fields = ("alive", "flipped", "tilted")
+    small_fields = ("activity", "life")
 
-        Parameters:
-            - direction (str): The direction in which the enemy should move ("right" or "left").
-        """
-        if self.alive:
-            self.state = "burned"
-            self.rect.y -= 5
-            self.rect.size = (0, 0)
-            self.alive = False
-        if direction == "right":
-            self.speed = 8
+    def __init__(
+        self,
+        path="../Packages/Textures/map/enemies/enemies.png",
+        capacity=64,
+        wake_distance=wake_distance,
+        sleep_distance=sleep_distance,
+        broadphase=None,
+        bounds=None,
+    ):
+        self.frames = import_cut_graphics(path, "enemy")
+        registry.prepare_masks(self.frames)
+        self.broadphase = broadphase if broadphase is not None else SweepAndPrune()
+        self.wake_distance = wake_distance
+        self.sleep_distance = sleep_distance
+        # Without bounds, only falling below the screen leaves the world.
+        if bounds is not None:
+            self.bounds = (bounds.left, bounds.top, bounds.right, bounds.bottom)
         else:
-            self.speed = -8
-
-    def update(self, shift):
-        """Updates the enemy's position and animation."""
-        self.rect.x += shift
-        self.animate()
-        if self.state != "stumped":
-            self.move()
-            self.reverse_image()
+            self.bounds = (no_limit_left, no_limit_left, no_limit_right, screen_height + 1)
+        self.count = 0
+        self.visible_count = 0
+
+        self.active = np.zeros(0, dtype=np.int64)
+        self.dormant = np.zeros(0, dtype=np.int64)
+        self.dormant_x = np.zeros(0, dtype=np.int64)
+        # Set when enemies are added or fall asleep, the sorted dormant arrays are rebuilt on the next update.
+        self.dormant_changed = False
+
+        for name in self.int_fields:
+            setattr(self, name, np.zeros(capacity, dtype=np.int64))
+        for name in self.float_fields:
+            setattr(self, name, np.zeros(capacity, dtype=np.float64))
+        for name in self.bool_fields:
+            setattr(self, name, np.zeros(capacity, dtype=bool))
+        for name in self.small_fields:
+            setattr(self, name, np.zeros(capacity, dtype=np.int8))
+
+    def __len__(self):
+        return self.count
+
+    def grow(self):
+        """Doubles the capacity of the arrays."""
+        for name in self.int_fields + self.float_fields + self.bool_fields + self.small_fields:
+            array = getattr(self, name)
+            setattr(self, name, np.concatenate((array, np.zeros_like(array))))
+
+    def add(self, specification, x, y):
+        """
+        Adds an enemy to the swarm.
+
+        Parameters:
+            specification (dict): The specification of the enemy type, from settings.enemy_specifications.
+            x (int): The x-coordinate of the top left corner of the enemy.
+            y (int): The y-coordinate of the top left corner of the enemy.
+
+        Returns:
+            index (int): The index of the new enemy.
+        """
+        if self.count == len(self.x):
+            self.grow()
+        index = self.count
+        self.count += 1
+
+        self.x[index] = x
+        self.y[index] = y
+        self.home_y[index] = y
+        self.width[index] = specification["width"]
+        self.height[index] = specification["height"]
+        self.speed[index] = randint(3, 5)
+        self.state[index] = ALIVE
+        self.alive[index] = True
+        self.bounce[index] = -10
+        self.angle[index] = 5
+        self.first_frame[index] = specification["start_frame_index"]
+        self.frame_count[index] = specification["frame_count"] - 1
+        self.frame[index] = specification["start_frame_index"]
+        self.shown_frame[index] = specification["start_frame_index"]
+        self.patrol_left[index] = no_limit_left
+        self.patrol_right[index] = no_limit_right
+        self.activity[index] = DORMANT
+        self.life[index] = LIVING
+        self.dying_time[index] = 0
+        self.dormant_changed = True
+        return index
+
+    def update_activity(self, camera):
+        """
+        Wakes the dormant enemies the view approached, and puts the active enemies left far behind back to sleep.
+
+        - The dormant enemies are sorted by x, the ones to wake are found with a binary search on the wake window.
+        - Active enemies farther than the sleep distance go dormant if they are living, dying ones are despawned (their
+          death animation isn't seen anyway).
+
+        Parameters:
+            camera (Camera): The camera of the level.
+        """
+        if self.dormant_changed:
+            dormant = np.flatnonzero(self.activity[: self.count] == DORMANT)
+            order = np.argsort(self.x[dormant], kind="stable")
+            self.dormant = dormant[order]
+            self.dormant_x = self.x[self.dormant]
+            self.dormant_changed = False
+
+        # Wake up
+        first = np.searchsorted(self.dormant_x, camera.x - self.wake_distance, side="left")
+        last = np.searchsorted(
+            self.dormant_x, camera.x + camera.width + self.wake_distance, side="right"
+        )
+        if last > first:
+            woken = self.dormant[first:last]
+            self.activity[woken] = ACTIVE
+            self.dormant = np.concatenate((self.dormant[:first], self.dormant[last:]))
+            self.dormant_x = np.concatenate((self.dormant_x[:first], self.dormant_x[last:]))
+            self.active = np.sort(np.concatenate((self.active, woken)))
+            self.proxy[woken] = self.broadphase.add_many(
+                ENEMY, woken, self.x[woken], self.y[woken], self.width[woken], self.height[woken]
+            )
+
+        # Sleep and despawn
+        active = self.active
+        x = self.x[active]
+        far = (x + self.width[active] < camera.x - self.sleep_distance) | (
+            x > camera.x + camera.width + self.sleep_distance
+        )
+        if far.any():
+            leaving = active[far]
+            living = self.life[leaving] == LIVING
+            self.activity[leaving[living]] = DORMANT
+            self.activity[leaving[~living]] = DESPAWNED
+            self.life[leaving[~living]] = DEAD
+            self.dormant_changed = bool(living.any())
+            self.broadphase.remove_many(self.proxy[leaving])
+            self.active = active[~far]
+
+        self.visible_count = len(self.active)
+
+    def activity_counts(self):
+        """Returns the number of active, dormant and despawned enemies."""
+        counts = np.bincount(self.activity[: self.count], minlength=3)
+        return int(counts[ACTIVE]), int(counts[DORMANT]), int(counts[DESPAWNED])
+
+    def reap(self):
+        """Despawns the dead active enemies, they leave the active set and the broadphase."""
+        active = self.active
+        dead = self.life[active] == DEAD
+        if dead.any():
+            self.activity[active[dead]] = DESPAWNED
+            self.broadphase.remove_many(self.proxy[active[dead]])
+            self.active = active[~dead]
+            self.visible_count = len(self.active)
+
+    def overlaps(self, rect, indices):
+        """Returns a boolean array, True for the enemies of the indices overlapping the rect."""
+        x, y = self.x[indices], self.y[indices]
+        width, height = self.width[indices], self.height[indices]
+        return (
+            (width > 0)
+            & (height > 0)
+            & (x < rect.right)
+            & (x + width > rect.left)
+            & (y < rect.bottom)
+            & (y + height > rect.top)
+        )
+
+    def collide(self, rect):
+        """
+        Finds the active enemies colliding with a rect.
+        - The candidates near the rect come from the broadphase, and are tested against their current hitbox.
+
+        Parameters:
+            rect (pygame.Rect): The rect to check, in world coordinates.
+
+        Returns:
+            indices (array): The indices of the colliding enemies, in the order they were added.
+        """
+        candidates = self.broadphase.query(rect, ENEMY)
+        return candidates[self.overlaps(rect, candidates)]
+
+    def collide_mask(self, rect, mask, pos):
+        """
+        Finds the active enemies whose drawn frame overlaps a mask, pixel-accurate.
+        - The enemies whose hitbox overlaps the rect are the candidates, only their masks are tested.
+
+        Parameters:
+            rect (pygame.Rect): The area covered by the mask, in world coordinates.
+            mask (pygame.mask.Mask): The mask to test (e.g. of the player's frame, or of an attack particle).
+            pos (tuple): The world position of the top left corner of the mask.
+
+        Returns:
+            indices (array): The indices of the overlapping enemies, in the order they were added.
+        """
+        hits = [
+            index
+            for index in self.collide(rect).tolist()
+            if mask.overlap(
+                registry.mask(self.image(index)),
+                (int(self.x[index]) - pos[0], int(self.y[index]) - pos[1]),
+            )
+        ]
+        return np.array(hits, dtype=np.int64)
+
+    def image(self, index):
+        """Returns the frame an enemy is drawn with (rotated while spinning, mirrored while walking right)."""
+        image = self.frames[self.shown_frame[index]]
+        if self.tilted[index]:
+            image = registry.rotated(image, self.tilt[index])
+        if self.flipped[index]:
+            image = registry.flipped(image)
+        return image
+
+    def set_patrols(self, constrained, walls, cell_size):
+        """
+        Computes the patrol interval of every enemy, from the cells it turns around on.
+        - An enemy turns around on the constrain cells overlapping any row of its hitbox, and on the walls of the row of
+          its feet (the tiles above it, e.g. an overhang at the height of a turtle's head, don't block it).
+        - The interval reaches from the nearest blocking cell on the left, to the nearest blocking cell on the right.
+        - Enemies without a blocking cell on a side patrol without a limit on that side.
+        - It's computed after the enemies of the level are added, and again when a tile of the terrain changes.
+
+        Parameters:
+            constrained (array): A 2D boolean array (rows, columns), True for the constrain cells.
+            walls (array): A 2D boolean array (rows, columns), True for the solid cells of the terrain.
+            cell_size (int): The width and height of a cell in pixels.
+        """
+        n = self.count
+        rows = constrained.shape[0]
+        x, y = self.x[:n], self.y[:n]
+        width, height = self.width[:n], self.height[:n]
+
+        first_row = np.clip(y // cell_size, 0, rows - 1)
+        last_row = np.clip((y + height - 1) // cell_size, 0, rows - 1)
+        # The first column fully right of the hitbox, and the last column fully left of it.
+        right_column = (x + width + cell_size - 1) // cell_size
+        left_column = x // cell_size - 1
+
+        self.patrol_left[:n] = no_limit_left
+        self.patrol_right[:n] = no_limit_right
+        for row_range in set(zip(first_row.tolist(), last_row.tolist())):
+            enemies = np.flatnonzero((first_row == row_range[0]) & (last_row == row_range[1]))
+            blocked = constrained[row_range[0] : row_range[1] + 1].any(axis=0) | walls[row_range[1]]
+            columns = np.flatnonzero(blocked)
+            if not len(columns):
+                continue
+
+            right = np.searchsorted(columns, right_column[enemies])
+            bounded = right < len(columns)
+            self.patrol_right[enemies[bounded]] = columns[right[bounded]] * cell_size
+
+            left = np.searchsorted(columns, left_column[enemies], side="right") - 1
+            bounded = left >= 0
+            self.patrol_left[enemies[bounded]] = (columns[left[bounded]] + 1) * cell_size
+
+    def patrol(self):
+        """Reverses the active enemies walking out of their patrol interval."""
+        active = self.active
+        x, width, speed = self.x[active], self.width[active], self.speed[active]
+        turn = (width > 0) & (
+            ((speed > 0) & (x + width > self.patrol_right[active]))
+            | ((speed < 0) & (x < self.patrol_left[active]))
+        )
+        self.speed[active[turn]] *= -1
+
+    def burn(self, indices, direction):
+        """
+        Burns the enemies, they bounce up, spin and fall off screen.
+
+        Parameters:
+            indices (array): The indices of the enemies to burn.
+            direction (str): The direction in which the enemies should move ("right" or "left").
+        """
+        burning = indices[self.alive[indices]]
+        self.state[burning] = BURNED
+        self.y[burning] -= 5
+        self.width[burning] = 0
+        self.height[burning] = 0
+        self.alive[burning] = False
+        self.life[burning] = DYING
+        self.dying_time[burning] = np.inf
+        self.speed[indices] = 8 if direction == "right" else -8
+
+    def stun(self, index):
+        """Stuns an enemy, it bounces up in place, then walks again."""
+        if self.alive[index]:
+            self.state[index] = STUNNED
+            self.y[index] -= 5
+            self.speed[index] = 0
+
+    def stumped(self, index):
+        """
+        Squashes an enemy, disabling its movement and rendering it inactive.
+        This method is called when the player jumps on the enemy, it's removed once the squashed animation is over.
+        """
+        if self.alive[index] and self.state[index] != STUNNED:
+            self.first_frame[index] += 2
+            self.frame_count[index] = 1
+            self.state[index] = STUMPED
+            self.width[index] = 0
+            self.height[index] = 0
+            self.alive[index] = False
+            self.life[index] = DYING
+            self.dying_time[index] = squash_time
+
+    def get_state(self, index):
+        """Returns the current state of an enemy, by name."""
+        return state_names[int(self.state[index])]
+
+    def update(self, camera, dt=1):
+        """
+        Animates and moves the active enemies.
+
+        - The frames are stepped, the walking enemies move horizontally, the stunned and burned enemies bounce.
+        - Enemies walking right show the mirrored frame, bouncing enemies show the frame rotated by their angle.
+        - The death animations are counted down, the enemies whose animation is over or that left the world die, and
+          the dead enemies are reaped.
+
+        Parameters:
+            camera (Camera): The camera of the level.
+            dt (float, optional): The number of frames simulated. Defaults to 1.
+        """
+        active = self.active
+        if not len(active):
+            return
+
+        # Animation
+        frame = self.frame[active] + 0.1 * dt
+        first_frame, frame_count = self.first_frame[active], self.frame_count[active]
+        wrapped = frame > first_frame + frame_count
+        frame[wrapped] -= frame_count[wrapped]
+        self.frame[active] = frame
+        self.shown_frame[active] = frame.astype(np.int64)
+        self.tilted[active] = False
+
+        # Movement
+        moving = active[self.state[active] != STUMPED]
+        self.x[moving] += np.floor(self.speed[moving] * dt + 0.5).astype(np.int64)
+
+        stunned = moving[self.state[moving] == STUNNED]
+        in_air = self.y[stunned] < self.home_y[stunned]
+        bouncing, landed = stunned[in_air], stunned[~in_air]
+
+        self.y[landed] = self.home_y[landed]
+        self.speed[landed] = 3
+        self.state[landed] = ALIVE
+        self.bounce[landed] = -10
+        self.angle[landed] = 0
+
+        burned = moving[self.state[moving] == BURNED]
+        for spinning in (bouncing, burned):
+            self.y[spinning] = np.floor(self.y[spinning] + self.bounce[spinning] * dt + 0.5)
+            self.bounce[spinning] += 0.3 * dt
+            self.tilt[spinning] = self.angle[spinning]
+            self.tilted[spinning] = True
+            self.angle[spinning] += 10 * dt
+
+        self.flipped[active] = False
+        self.flipped[moving] = self.speed[moving] > 0
+
+        # Lifecycle
+        dying = active[self.life[active] == DYING]
+        self.dying_time[dying] -= dt
+        self.life[dying[self.dying_time[dying] <= 0]] = DEAD
+
+        left, top, right, bottom = self.bounds
+        x, y = self.x[active], self.y[active]
+        out = active[(x < left) | (x >= right) | (y < top) | (y >= bottom)]
+        self.alive[out] = False
+        self.life[out] = DEAD
+        self.reap()
+
+        active = self.active
+        self.broadphase.move_many(
+            self.proxy[active], self.x[active], self.y[active], self.width[active], self.height[active]
+        )
+
+    def draw(self, camera, surface):
+        """
+        Draws the active enemies.
+
+        Parameters:
+            camera (Camera): The camera of the level.
+            surface (pygame.Surface): The surface to draw upon.
+        """
+        frames = self.frames
+        indices = self.active
+        enemies = zip(
+            self.shown_frame[indices].tolist(),
+            self.tilted[indices].tolist(),
+            self.tilt[indices].tolist(),
+            self.flipped[indices].tolist(),
+            self.x[indices].tolist(),
+            self.y[indices].tolist(),
+        )
+
+        blits = []
+        for frame, tilted, tilt, flipped, x, y in enemies:
+            image = frames[frame]
+            if tilted:
+                image = registry.rotated(image, tilt)
+            if flipped:
+                image = registry.flipped(image)
+
+            x -= camera.x
+            if -image.get_width() < x < camera.width:
+                blits.append((image, (x, y)))
+        surface.blits(blits, False)
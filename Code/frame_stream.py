@@ -0,0 +1,122 @@
+import os
+import threading
+from collections import deque
+import pygame
+
+
+class FrameStream:
+    """
+    Plays a folder of animation frames, without keeping the whole animation in memory.
+
+    - A background thread decodes the frames ahead of the playback, in sorted file name order, and scales them to the
+      given size.
+    - A frame is converted to the display format on the main thread, when it's taken out of the buffer to be shown
+      (SDL doesn't guarantee the conversion is thread-safe while the display is drawn to).
+    - The prepared frames wait in a small ring buffer, the thread pauses while the buffer is full, so only a few frames
+      are in memory at any time.
+    - If the next frame isn't decoded in time, the current frame is shown a little longer, the game never waits for
+      the decoder (except for the very first frame).
+
+    Attributes:
+        paths (list): The paths of the frames, in playback order.
+        size (tuple): The size (width, height) the frames are scaled to.
+        buffer_size (int): The number of decoded frames kept ahead of the playback.
+        buffer (deque): The decoded frames waiting to be shown, as (index, surface) pairs.
+        index (int): The index of the frame being shown.
+        frame (pygame.Surface): The frame being shown.
+
+    Methods:
+        - current()
+        - advance()
+    """
+
+    def __init__(self, path, size, buffer_size=4):
+        self.paths = [path + "/" + img_file for img_file in sorted(os.listdir(path))]
+        self.size = size
+        self.buffer_size = buffer_size
+        self.buffer = deque()
+        self.condition = threading.Condition()
+        self.index = 0
+        self.frame = None
+
+        self.thread = threading.Thread(target=self.decode_frames, daemon=True)
+        self.thread.start()
+
+    def __len__(self):
+        return len(self.paths)
+
+    def decode_frames(self):
+        """Decodes and scales the frames in a loop, on the background thread, while there is room in the buffer."""
+        index = 0
+        while True:
+            with self.condition:
+                while len(self.buffer) >= self.buffer_size:
+                    self.condition.wait()
+
+            try:
+                frame = pygame.transform.scale(pygame.image.load(self.paths[index]), self.size)
+            except pygame.error:
+                # pygame was shut down, the stream stops with it
+                return
+
+            with self.condition:
+                self.buffer.append((index, frame))
+                self.condition.notify_all()
+            index = (index + 1) % len(self.paths)
+
+    def next_frame(self, wait):
+        """
+        Takes the next decoded frame out of the buffer, optionally waiting for the decoder, and converts it to the
+        display format (once the display exists).
+        """
+        with self.condition:
+            if wait:
+                while not self.buffer:
+                    self.condition.wait()
+            if not self.buffer:
+                return False
+
+            index, frame = self.buffer.popleft()
+            self.condition.notify_all()
+
+        if pygame.display.get_surface() is not None:
+            frame = frame.convert()
+        self.index, self.frame = index, frame
+        return True
+
+    def current(self):
+        """Returns the frame being shown, waiting for the first frame to be decoded if needed."""
+        if self.frame is None:
+            self.next_frame(wait=True)
+        return self.frame
+
+    def advance(self):
+        """
+        Moves the playback to the next frame, if it is decoded already.
+
+        Returns:
+            index (int): The index of the frame being shown.
+        """
+        self.next_frame(wait=False)
+        return self.index
+
+
+# Streams shared by the whole process, so reopening a scene continues the playback, instead of decoding it again.
+streams = {}
+
+
+def frame_stream(path, size):
+    """
+    Returns the shared frame stream of the given folder, starting it on the first request.
+
+    Parameters:
+        path (str): The path to the folder containing the frames.
+        size (tuple): The size (width, height) the frames are scaled to.
+
+    Returns:
+        FrameStream: The frame stream of the folder.
+    """
+    key = (path, size)
+    if key not in streams:
+        streams[key] = FrameStream(path, size)
+    return streams[key]
@@ -1,9 +1,12 @@
 """
 This file contains data about the ../Levels, such as:
     - The CSV files, containing the data_map of the level
+      (a level can instead name its Tiled map with a "tmx" key, then all layers are read from that single file)
+    - The compiled level file, rebuilt from the CSV files whenever they change
     - The node position describing the location on the overworld map
     - The next level, to be unlocked
     - The background color of the level
+    - Whether the level ends with a boss fight, so its assets can be preloaded
 """
 level_1 = {
     "base": "../Levels/1/Level_1_base.csv",
@@ -13,6 +16,7 @@ level_1 = {
     "enemies": "../Levels/1/Level_1_mobs.csv",
     "player": "../Levels/1/Level_1_player.csv",
     "goal": "../Levels/1/Level_1_goal.csv",
+    "compiled": "../Levels/1/Level_1.lvl",
     "node_pos": (475, 530),
     "unlock": 2,
     "background_color": (0, 171, 240),
@@ -26,6 +30,7 @@ level_2 = {
     "enemies": "../Levels/2/Level_2_mobs.csv",
     "player": "../Levels/2/Level_2_player.csv",
     "goal": "../Levels/2/Level_2_goal.csv",
+    "compiled": "../Levels/2/Level_2.lvl",
     "node_pos": (660, 530),
     "unlock": 3,
     "background_color": (0, 0, 0),
@@ -39,6 +44,7 @@ level_3 = {
     "enemies": "../Levels/3/Level_3_mobs.csv",
     "player": "../Levels/3/Level_3_player.csv",
     "goal": "../Levels/3/Level_3_goal.csv",
+    "compiled": "../Levels/3/Level_3.lvl",
     "node_pos": (660, 340),
     "unlock": 4,
     "background_color": (0, 171, 240),
@@ -52,9 +58,11 @@ level_4 = {
     "enemies": "../Levels/4/Level_4_mobs.csv",
     "player": "../Levels/4/Level_4_player.csv",
     "goal": "../Levels/4/Level_4_goal.csv",
+    "compiled": "../Levels/4/Level_4.lvl",
     "node_pos": (660, 205),
     "background_color": (0, 0, 0),
     "unlock": 5,
+    "boss": True,
 }
 level_5 = {
     "base": "../Levels/4/Level_4_base.csv",
@@ -64,8 +72,10 @@ level_5 = {
     "enemies": "../Levels/4/Level_4_mobs.csv",
     "player": "../Levels/4/Level_4_player.csv",
     "goal": "../Levels/4/Level_4_goal.csv",
+    "compiled": "../Levels/4/Level_4.lvl",
     "node_pos": (890, 205),
     "unlock": 5,
+    "boss": True,
 }
 
 levels = {1: level_1, 2: level_2, 3: level_3, 4: level_4, 5: level_5}
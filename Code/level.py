@@ -1,11 +1,22 @@
+import numpy as np
 import pygame
-from support import import_csv_layout, import_cut_graphics
+from functools import partial
+from support import import_cut_graphics
+from level_loader import load_level
 from settings import *
-from tiles import Tile, StaticTile, Background, AnimatedTile
-from enemies import Enemy
+from tiles import Tile, AnimatedTile
+from tilemap import TileMap
+from tile_types import tile_types, merged_layers, SOLID, BOUNCY, COIN, GOAL, CONSTRAIN
+from assets import registry
+from enemies import EnemySwarm, STUMPED
 from player import Player, PlayerMovements
-from objects import Coins, PowerUp
+from objects import PowerUp, ObjectPool
+from particles import ParticleSystem, circle_frames, quarter_frames
 from boss import Boss
+from camera import Camera, ChunkedGroup, BakedLayer
+from collision import TileGrid, SweepAndPrune, BOSS, FIREBALL, POWER_UP, sweep, pixel_step
+from triggers import TriggerIndex
+from lifecycle import LifecycleManager
 from game_data import levels
 
 
@@ -13,12 +24,19 @@ class Level(Player):
     """
     - This class is responsible for most processes, such as collision checking, creating and displaying the sprites.
     - The level layouts are created from CVS files, exported from Tiled level editor.
-    - CSV files are used to generate and draw levels.
+    - The CSV files are compiled into a single binary file per level, which is used to generate and draw levels.
 
     Attributes:
         - General
             display_surface: the surface, the level should be displayed upon
-            world_shift: moves all sprites, to stimulate camera movement if the player would exit the screen
+            camera: holds the scrolling of the view, sprites stay in world coordinates and are shifted only when drawn
+            broadphase: the SweepAndPrune of the moving entities (enemies, boss, fireball, power up), the interactions
+                        with the player only test the entities near it
+            proxies: the broadphase boxes of the single entities (boss, fireball, power ups), by kind and owner
+            world: the world bounds, the level and a screen around it (the kill plane starts below it),
+                   entities leaving it are reaped
+            lifecycles: the LifecycleManager of the single entities (power ups, boss), it reaps them once they
+                        are dead, the enemies have their own lifecycle (see EnemySwarm)
 
         - Overworld
             create_overworld: a function to be called when the level is left
@@ -26,10 +44,22 @@ class Level(Player):
             new_max_level: for the unlocking of new levels
 
         - Tiles
+            The static layers (base, goal, constrains, background) are TileMaps, arrays of tile ids with shared textures.
+            The animated blocks are a ChunkedGroup, only the chunks near the view are updated and drawn.
+            enemies: the EnemySwarm of the level, every enemy is simulated on NumPy arrays instead of as a sprite,
+                     and only while the view is near (see settings.wake_distance)
+            terrain: the base and goal layers, pre-rendered into large chunks by BakedLayer
             tile_animation speed: determines the animation speed of the animated tiles
-            ...layout: the return value of the import_cvs_layout function, that processes the CSV files into lists.
+            layout: the return value of the load_level function, that holds every layer of the level as rows of tile ids.
+            ...map: the TileMap of a static layer, base_map also holds the solid and bouncy flags of the terrain tiles,
+                    and the colliders of the terrain (runs of solid tiles merged into large rectangles)
             ...sprites: the return value of the create_tile_group method, that iterates over the layout list, and creates sprites accordingly.
             ...tile_list: the return value of the import_cut_graphics, that cuts the spritesheet images to 64x64 tile textures, returns them in a list
+            tile_grid: the TileGrid of the animated tiles, used with base_map for the player and boss collisions
+            bumped_tiles: the animated tiles displaced by a bump, re-indexed on the tile grid until they are back in place
+            constrained: the occupied cells of the constrains layer, the enemies turn around on them and on the solid terrain
+            triggers: the TriggerIndex of the invisible volumes of the level (goal, kill plane, constrains), the player
+                      looks them up once per frame, and the handler of their kind is called (see trigger_handlers)
 
         - Player
             change_form: A method to track the form of the player between levels
@@ -37,35 +67,53 @@ class Level(Player):
             alive: tracks if player is alive or not
             invincible: tracks i-frames
             damage_time: tracks when the player got damaged
+            player_shift: the distance the player moved horizontally in the last frame, the camera scrolls by it
 
         - Boss
             boss: the sprite of the boss
+            boss_awake: the boss stays dormant (not updated, drawn or collided with) until the view reaches its arena
 
         - User Interface
             change_lives: The change_lives function from main
             change_coins: The change_coins function from main
 
         - Objects
-            self.coin_sprites: A spritegroup for the coins
-            self.power_up_sprites: A spritegroup for the power ups
+            self.power_up_sprites: A spritegroup for the power ups, several of them can be out at once
+            self.object_pools: The ObjectPools of the power ups by kind, preallocated when the level is loaded, the
+                               objects return to them once they are reaped
+            self.particles: The ParticleSystem of the level, for the coin pops, brick debris, stomp dust and fire sparks
 
     Methods:
         - create_tile_group(layout, type)
+        - add_enemy(tile_type, tile_id, x, y, group), add_boss(...), add_question_block(...), add_player(...),
+          add_level_end(...): the factories of the tile types
+        - update_activity()
         - enemy_collision_reverse()
         - enemy_player_collision()
         - invincibility_timer()
         - scroll_x()
-        - horizontal_collisions()
+        - horizontal_collisions(dt=1)
+        - vertical_movement(dt=1)
         - vertical_collisions()
         - animated_collisions()
-        - boss_player_collisions()
+        - boss_player_collisions(dt=1)
         - projectile_collisions()
         - boss_tile_collisions()
-        - animate_objects()
+        - animate_objects(dt=1)
+        - reap_power_up(power_up), reap_boss(boss)
+        - track(kind, rect, owner=0)
+        - solid_tiles(rect)
+        - set_base_tile(column, row, tile_id)
+        - update_bumped_tiles()
         - player_powerup_collisions()
+        - check_triggers()
+        - fall_off()
         - check_death(died=False)
         - check_win()
-        - run()
+        - visible_sprite_count()
+        - entity_counts()
+        - pool_stats()
+        - run(dt=1)
     """
 
     def __init__(
@@ -84,10 +132,18 @@ class Level(Player):
         self.current_level = current_level
         level_data = levels[self.current_level]
         self.new_max_level = level_data["unlock"]
+        self.layout = load_level(level_data)
 
         # base
         self.display_surface = surface
-        self.world_shift = 0
+        self.camera = Camera()
+        self.broadphase = SweepAndPrune()
+        self.proxies = {}
+        level_width = self.layout.width * tile_size
+        self.world = pygame.Rect(
+            -screen_width, -screen_height, level_width + 2 * screen_width, 2 * screen_height + 1
+        )
+        self.lifecycles = LifecycleManager(self.world)
 
         self.base_tile_list = import_cut_graphics(
             "../Packages/Textures/map/blocks/static/super_mario_bros__tile_revamp_by_malice936_d5ik1aw_scaled_4x_pngcrushed (1).png",
@@ -99,24 +155,27 @@ class Level(Player):
             "../Packages/Textures/map/blocks/static/castle.png",
             "goal",
         )
-        goal_layout = import_csv_layout(level_data["goal"])
+        goal_layout = self.layout.layers["goal"]
         self.goal = pygame.sprite.GroupSingle()
-        self.goal_sprites = self.create_tile_group(goal_layout, "goal")
+        self.goal_map = TileMap(
+            goal_layout, self.goal_tile_list, tile_types["goal"], merged_flags=GOAL
+        )
 
         # animated
         self.tile_animation_speed = 0.2
-        animated_layout = import_csv_layout(level_data["animated"])
+        animated_layout = self.layout.layers["animated"]
         self.animated_sprites = self.create_tile_group(animated_layout, "animated")
 
         # player
         self.change_form = change_form
-        player_layout = import_csv_layout(level_data["player"])
+        player_layout = self.layout.layers["player"]
         self.player = pygame.sprite.GroupSingle()
         self.create_tile_group(player_layout, "player")
         self.player_form = player_form
         self.alive = True
         self.invincible = False
         self.damage_time = 0
+        self.player_shift = 0
         # The player's form is defaulted, to what it finished the last level with
         if self.player_form == "big":
             PlayerMovements.grow(self.player.sprite)
@@ -127,54 +186,99 @@ class Level(Player):
         # boss
         self.boss = pygame.sprite.GroupSingle()
         self.fire_ball = pygame.sprite.GroupSingle()
+        self.boss_awake = False
 
         # UI
         self.change_lives = change_lives
         self.change_coins = change_coins
 
         # objects
-        self.coin_sprites = pygame.sprite.GroupSingle()
-        self.power_up_sprites = pygame.sprite.GroupSingle()
-
-        # sprite group to differenciate bouncy-tiles from normal base-tiles
-        self.bounce_blocks = pygame.sprite.Group()
+        self.power_up_sprites = pygame.sprite.Group()
+        self.object_pools = {
+            "power_up": ObjectPool(
+                partial(PowerUp, (0, 0), "small"), object_pool_sizes["power_up"]
+            ),
+        }
+
+        # base, the flags of the terrain tiles (solid, bouncy) come from the tile type registry
+        # the solid tiles are merged into large colliders, the merged rectangles are cached in the compiled level
+        base_layout = self.layout.layers["base"]
+        self.base_map = TileMap(
+            base_layout,
+            self.base_tile_list,
+            tile_types["base"],
+            merged_flags=merged_layers["base"],
+            merged=self.layout.merged["base"],
+        )
 
-        # base
-        self.base_tile_list = import_cut_graphics(
-            "../Packages/Textures/map/blocks/static/super_mario_bros__tile_revamp_by_malice936_d5ik1aw_scaled_4x_pngcrushed (1).png",
-            "terrain",
+        # particles, the debris is cut from the brick texture of the terrain
+        self.particles = ParticleSystem(
+            {
+                "coin": [registry.image("../Packages/Textures/map/objects/coin.png", (0, 0, 0))],
+                "debris": quarter_frames(self.base_tile_list[debris_tile_id]),
+                "dust": circle_frames((235, 230, 220), (10, 9, 7, 5)),
+                "sparks": circle_frames((255, 170, 40), (5, 4, 3, 2)),
+            }
         )
-        base_layout = import_csv_layout(level_data["base"])
-        self.base_sprites = self.create_tile_group(base_layout, "base")
 
         # enemies
-        goomba_layout = import_csv_layout(level_data["enemies"])
-        self.goomba_sprites = self.create_tile_group(goomba_layout, "enemies")
-        self.collidable_enemies = self.goomba_sprites
-
-        # constrains
-        constrains_layout = import_csv_layout(level_data["constrains"])
-        self.constrains_sprites = self.create_tile_group(
-            constrains_layout, "constrains"
+        goomba_layout = self.layout.layers["enemies"]
+        self.enemies = EnemySwarm(broadphase=self.broadphase, bounds=self.world)
+        self.create_tile_group(goomba_layout, "enemies")
+
+        # constrains, used to compute the patrol intervals of the enemies, and kept as trigger volumes
+        constrains_layout = self.layout.layers["constrains"]
+        constrains_map = TileMap(
+            constrains_layout, types=tile_types["constrains"], merged_flags=CONSTRAIN
         )
-
-        # background_setup
-        background_layout = import_csv_layout(level_data["background"])
-        self.background_sprites = self.create_tile_group(
-            background_layout, "background"
+        self.constrained = constrains_map.occupancy()
+        self.enemies.set_patrols(self.constrained, self.base_map.occupancy(SOLID), tile_size)
+
+        # triggers, the goal and constrain tiles are merged into large volumes
+        # the kill plane is the area below the world, the player falls off once entirely inside it
+        self.triggers = TriggerIndex(level_width)
+        self.triggers.add(
+            "kill",
+            pygame.Rect(self.world.left, self.world.bottom, self.world.width, 10**6),
+            enclose=True,
         )
-
-        # collidable_tiles
-        self.collidable_sprites = (
-            self.base_sprites.sprites() + self.animated_sprites.sprites()
+        for kind, tile_map in (("goal", self.goal_map), ("constrain", constrains_map)):
+            for column, row, width, height in tile_map.merged_rects():
+                self.triggers.add(
+                    kind,
+                    pygame.Rect(
+                        column * tile_size, row * tile_size, width * tile_size, height * tile_size
+                    ),
+                )
+
+        # background_setup, the decor is drawn from the bottom left corner of the next cell
+        background_layout = self.layout.layers["background"]
+        decor_textures = [
+            registry.image(path) if path else None
+            for path in tile_types["background"].textures()
+        ]
+        self.background_map = TileMap(
+            background_layout, decor_textures, tile_types["background"], (tile_size, 0)
         )
 
+        # static layers, pre-rendered
+        # (the background decor has per-pixel alpha, it's cheaper to draw the few visible tiles, than alpha chunks)
+        self.terrain = BakedLayer(self.base_map, self.goal_map)
+
+        # animated tiles, indexed on the tile grid (the static solid tiles are looked up on base_map)
+        self.tile_grid = TileGrid(self.animated_sprites)
+        # animated tiles displaced by a bump, re-indexed every frame until they are back in place
+        self.bumped_tiles = set()
+
     def create_tile_group(self, layout, type):
         """
-        - This function iterates over the given layout list, which is a 2D list with 14 rows, each containing several hundred values.
-        - The values are used to determine the image of each tile based on the tile_list, which contains textures for different tile types.
+        - This function finds the tiles to create in the given layout list, which is a 2D list with 14 rows, each containing several hundred tile ids.
         - A value of -1 represents an empty tile.
+        - The layout is turned into an array, and the cells whose tile id has a factory are found at once (with a lookup
+          table indexed by tile id), so only the occupied cells are visited, in row order.
         - The position of each tile is determined by multiplying the column and row indices by the standard size of the tiles (64).
+        - Every tile id is looked up in the tile type registry of the layer (tile_types.py), and the factory of its type
+          creates the sprite. Only the dynamic layers (enemies, animated, player) have factories, the static layers are TileMaps.
 
         - Args:
                 self: The Level instance
@@ -182,97 +286,77 @@ class Level(Player):
                 type: the name of the tile layer
 
         - Returns:
-                sprite_group: A pygame spritegroup that contains all the sprites of the tiles within the specific tile layer
-        """
-        sprite_group = pygame.sprite.Group()
-        for row_index, row in enumerate(layout):
-            for col_index, val in enumerate(row):
-                if val != "-1":
-                    x = col_index * tile_size
-                    y = row_index * tile_size
-
-                    if type == "base":
-                        base_surface = self.base_tile_list[int(val)]
-                        sprite = StaticTile((tile_size, tile_size), x, y, base_surface)
-                        if int(val) in [0, 1, 2]:
-                            self.bounce_blocks.add(sprite)
-                        sprite_group.add(sprite)
-
-                    elif type == "goal":
-                        goal_surface = self.goal_tile_list[int(val)]
-                        sprite = StaticTile((tile_size, tile_size), x, y, goal_surface)
-                        sprite_group.add(sprite)
-
-                    elif type == "enemies":
-                        if val == "B":
-                            sprite = Boss((x - 50, y - 130), self.display_surface)
-                            self.boss.add(sprite)
-                        else:
-                            enemy = enemies_by_id[str(val)]
-                            sprite = Enemy(
-                                (enemy["width"], enemy["height"]),
-                                x - (enemy["width"] - tile_size),
-                                y - (enemy["height"] - tile_size),
-                                enemy["start_frame_index"],
-                                "../Packages/Textures/map/enemies/enemies.png",
-                                "enemy",
-                                enemy["frame_count"] - 1,
-                            )
-                            sprite_group.add(sprite)
-
-                    elif type == "animated":
-                        block_type = "power-up-block"
-                        if int(val) == 0 or int(val) == 3:
-                            block_type = "coin-block"
-                        sprite = AnimatedTile(
-                            (tile_size, tile_size),
-                            x,
-                            y,
-                            int(val) * 4,
-                            "../Packages/Textures/map/blocks/animated/question-block.png",
-                            block_type,
-                            4,
-                        )
-                        sprite_group.add(sprite)
-
-                    elif type == "player":
-                        if val == "1":
-                            sprite = Player((x, y), self.display_surface)
-                            self.player.add(sprite)
-
-                        if val == "0":
-                            sprite = Tile((tile_size, tile_size), x, y)
-                            self.goal.add(sprite)
-
-                    elif type == "constrains":
-                        sprite = Tile((tile_size, tile_size), x, y)
-                        sprite_group.add(sprite)
-
-                    elif type == "background":
-                        if val == "1":
-                            sprite = Background(
-                                "../Packages/Textures/map/decor/bush.png",
-                                (tile_size, tile_size),
-                                x,
-                                y,
-                            )
-                            sprite_group.add(sprite)
-                        elif val == "0":
-                            sprite = Background(
-                                "../Packages/Textures/map/decor/cloud.png",
-                                (tile_size, tile_size),
-                                x,
-                                y,
-                            )
-                            sprite_group.add(sprite)
+                sprite_group: A ChunkedGroup that contains all the sprites of the tiles within the specific tile layer
+        """
+        sprite_group = ChunkedGroup()
+        table = tile_types[type]
+        factories = {}
+
+        tiles = np.array(layout, dtype=np.int64)
+        if not tiles.size:
+            return sprite_group
+        first_id = int(tiles.min())
+        types = [table[tile_id] for tile_id in range(first_id, int(tiles.max()) + 1)]
+        spawned = np.array([tile_type is not None and tile_type.factory is not None for tile_type in types])
+        occupied = spawned[tiles - first_id] & (tiles != -1)
+
+        for row_index, col_index in zip(*(indices.tolist() for indices in np.nonzero(occupied))):
+            val = int(tiles[row_index, col_index])
+            tile_type = types[val - first_id]
+            if tile_type.factory not in factories:
+                factories[tile_type.factory] = getattr(self, tile_type.factory)
+            factories[tile_type.factory](
+                tile_type,
+                val,
+                col_index * tile_size,
+                row_index * tile_size,
+                sprite_group,
+            )
 
         return sprite_group
 
+    def add_enemy(self, tile_type, tile_id, x, y, group):
+        """Adds an enemy to the swarm from its specification, standing on the bottom of its cell."""
+        enemy = tile_type.data
+        self.enemies.add(
+            enemy,
+            x - (enemy["width"] - tile_size),
+            y - (enemy["height"] - tile_size),
+        )
+
+    def add_boss(self, tile_type, tile_id, x, y, group):
+        """Creates the boss of the level, it's reaped once it fell out of the world after its death."""
+        self.lifecycles.spawn(
+            Boss((x - 50, y - 130), self.display_surface, self.camera), self.boss, self.reap_boss
+        )
+
+    def add_question_block(self, tile_type, tile_id, x, y, group):
+        """Creates a question block, its animation starts at the frames of its tile id."""
+        sprite = AnimatedTile(
+            (tile_size, tile_size),
+            x,
+            y,
+            tile_id * 4,
+            "../Packages/Textures/map/blocks/animated/question-block.png",
+            tile_type.name,
+            4,
+            tile_type.flags,
+        )
+        group.add(sprite)
+
+    def add_player(self, tile_type, tile_id, x, y, group):
+        """Creates the player at its spawn point."""
+        self.player.add(Player((x, y), self.display_surface, self.camera))
+
+    def add_level_end(self, tile_type, tile_id, x, y, group):
+        """Creates the tile marking the end of the level."""
+        self.goal.add(Tile((tile_size, tile_size), x, y))
+
     def enemy_collision_reverse(self):
         """
-        - This function iterates over the goomba_sprites group, which contains the enemy sprites.
-        - If an enemy collides with any sprite in the constrains_sprites group (representing obstacles),
-        - the enemy's movement direction is reversed.
+        - If an enemy walks out of its patrol interval (to the nearest constrain or wall, computed when the level is
+        - loaded), the enemy's movement direction is reversed.
+        - The whole swarm is tested at once, by comparing the enemies against their two patrol bounds.
 
         Args:
             self: The Level instance.
@@ -280,18 +364,19 @@ class Level(Player):
         Returns:
             None
         """
-        for enemy in self.goomba_sprites.sprites():
-            if pygame.sprite.spritecollide(enemy, self.constrains_sprites, False):
-                enemy.reverse()
+        self.enemies.patrol()
 
     def enemy_player_collision(self):
         """
         Handles collisions between enemies and the player.
 
         - Retrieves the player's status and direction.
-        - Checks for collisions between the player and collidable enemies.
+        - Checks for collisions between the player and the enemies: the enemies near the player come from the
+          broadphase, then the masks of the drawn frames are tested, so only touching pixels count as a hit.
+        - The fire attack hits the enemies the drawn attack particle overlaps, pixel-accurate too, and they burn in a
+          burst of sparks.
         - Updates enemy behavior based on collision and player status.
-        - Handles enemy death when the player attacks or jumps on enemy.
+        - Handles enemy death when the player attacks or jumps on enemy (a squashed enemy kicks up dust).
         - Stuns enemies when the player slides into an enemy.
         - Handles player invincibility and damage if applicable.
 
@@ -304,34 +389,45 @@ class Level(Player):
 
         player = self.player.sprite
         player_status, player_right = Player.get_status(player)[:2]
-        enemy_collision_list = pygame.sprite.spritecollide(
-            player, self.collidable_enemies, False
-        )
-
-        for enemy in self.goomba_sprites:
-            if "attack" in player_status:
-                if enemy.rect.colliderect(player.rect.inflate(130, 10)):
-                    direction = "right" if player_right else "left"
-                    Enemy.burn(enemy, direction)
+        enemies = self.enemies
+
+        if "attack" in player_status:
+            direction = "right" if player_right else "left"
+            particle = player.particle_image
+            if particle is not None:
+                pos = (int(player.particle_pos[0]), int(player.particle_pos[1]))
+                hits = enemies.collide_mask(
+                    particle.get_rect(topleft=pos), registry.mask(particle), pos
+                )
+                for enemy in hits.tolist():
+                    self.particles.emit(
+                        "sparks",
+                        enemies.x[enemy] + enemies.width[enemy] // 2,
+                        enemies.y[enemy] + enemies.height[enemy] // 2,
+                    )
+                enemies.burn(hits, direction)
+            return
+
+        player_area = player.image.get_rect(topleft=player.rect.topleft)
+        hits = enemies.collide_mask(player_area, player.mask, player.rect.topleft)
+        for enemy in hits.tolist():
+            if player_status == "slide":
+                enemies.stun(enemy)
             else:
-                if enemy in enemy_collision_list:
-                    if player_status == "slide":
-                        Enemy.stun(enemy)
-                    else:
-                        if player.rect.bottom <= enemy.rect.top + 40:
-                            Enemy.stumped(enemy)
-                            PlayerMovements.jump(player, -10)
+                if player.rect.bottom <= enemies.y[enemy] + 40:
+                    feet = (enemies.x[enemy] + enemies.width[enemy] // 2, enemies.y[enemy] + enemies.height[enemy])
+                    enemies.stumped(enemy)
+                    if enemies.state[enemy] == STUMPED:
+                        self.particles.emit("dust", *feet)
+                    PlayerMovements.jump(player, -10)
+                else:
+                    if not self.invincible and enemies.get_state(enemy) != "stunned":
+                        self.alive = PlayerMovements.damage(player)
+                        if not self.alive:
+                            self.check_death(True)
                         else:
-                            if (
-                                not self.invincible
-                                and Enemy.get_state(enemy) != "stunned"
-                            ):
-                                self.alive = PlayerMovements.damage(player)
-                                if not self.alive:
-                                    self.check_death(True)
-                                else:
-                                    self.invincible = True
-                                    self.damage_time = pygame.time.get_ticks()
+                            self.invincible = True
+                            self.damage_time = pygame.time.get_ticks()
 
     def invincibility_timer(self):
         """
@@ -341,6 +437,7 @@ class Level(Player):
         - Retrieves the current time in milliseconds.
         - Compares the time elapsed since the last damage with the invincibility duration (2500 milliseconds).
         - Resets the player's invincibility state if the duration has passed.
+        - Sets the alpha of the player's frames, the player shows translucent frames while invincible.
 
         Args:
             self: The Level instance.
@@ -352,18 +449,19 @@ class Level(Player):
             current_time = pygame.time.get_ticks()
             if current_time - self.damage_time >= 2500:
                 self.invincible = False
-            self.player.sprite.image.set_alpha(140)
+            self.player.sprite.alpha = invincible_alpha
         else:
-            self.player.sprite.image.set_alpha(255)
+            self.player.sprite.alpha = 255
 
     def scroll_x(self):
         """
-        Adjusts the world shift and player speed based on the player's horizontal position.
+        Scrolls the camera based on the player's horizontal position on the screen.
 
-        - Retrieves the player's sprite, center x-coordinate, and x-direction.
+        - Retrieves the player's sprite, center x-coordinate on the screen, and its horizontal move of this frame.
         - Checks if the player is near the left or right edges of the screen.
-        - Sets the world shift and player speed accordingly for smooth scrolling.
-        - Resets the world shift and sets the player speed to the default value if the player is within the middle range of the screen.
+        - Scrolls the camera by the distance the player actually moved (a move cut short by a wall scrolls less), so the
+          player stays at the same place on the screen.
+        - Doesn't scroll if the player is within the middle range of the screen.
 
         Args:
             self: The Level instance.
@@ -372,39 +470,37 @@ class Level(Player):
             None
         """
         player = self.player.sprite
-        player_x = player.rect.centerx
-        direction_x = player.direction.x
-
-        if player_x < screen_width / 4 and direction_x < 0:
-            self.world_shift = 8
-            player.speed = 0
-        elif player_x > screen_width * 0.6 and direction_x > 0:
-            self.world_shift = -8
-            player.speed = 0
-        else:
-            self.world_shift = 0
-            player.speed = 8
+        player_x = player.rect.centerx - self.camera.x
+        distance = self.player_shift
 
-    def horizontal_collisions(self):
+        if player_x < screen_width / 4 and distance < 0:
+            self.camera.scroll(distance)
+        elif player_x > screen_width * 0.6 and distance > 0:
+            self.camera.scroll(distance)
+
+    def horizontal_collisions(self, dt=1):
         """
         Handles horizontal collisions for the player.
 
         - Retrieves the player's sprite and updates its horizontal position based on the direction and speed.
-        - Performs horizontal collision detection with the collidable sprites.
+        - The move is swept against the solid tiles, so it stops at the first tile in its path, even if it's longer than a tile.
+        - Performs horizontal collision detection with the collidable sprites, looked up on the tile grid.
         - Adjusts the player's position based on the collided sprite to resolve the collision.
+        - Keeps the distance the player actually moved, the camera scrolls by it (see scroll_x).
 
         Args:
             self: The Level instance.
+            dt: The number of frames simulated.
 
         Returns:
             None
         """
         player = self.player.sprite
-        player.rect.x += player.direction.x * player.speed
+        start_x = player.rect.x
+        distance = pixel_step(player.direction.x * player.speed * dt)
+        player.rect.x += sweep(player.rect, distance, 0, self.solid_tiles)
 
-        collided_sprites = pygame.sprite.spritecollide(
-            player, self.collidable_sprites, False
-        )
+        collided_sprites = self.solid_tiles(player.rect)
 
         for sprite in collided_sprites:
             if player.direction.x > 0:
@@ -412,12 +508,29 @@ class Level(Player):
             elif player.direction.x < 0:
                 player.rect.left = sprite.rect.right
 
+        self.player_shift = player.rect.x - start_x
+
+    def vertical_movement(self, dt=1):
+        """
+        Applies gravity to the player, and moves it vertically.
+        - The move is swept against the solid tiles, so a fast fall (or a long time step) can't pass through a platform.
+          The landing itself is handled by vertical_collisions.
+
+        Args:
+            self: The Level instance.
+            dt: The number of frames simulated.
+        """
+        player = self.player.sprite
+        distance = pixel_step(player.apply_gravity(dt))
+        player.rect.y += sweep(player.rect, distance, 1, self.solid_tiles)
+
     def vertical_collisions(self):
         """
         Handles vertical collisions for the player.
 
         - Retrieves the player's sprite and status.
-        - Iterates over the collidable sprites and checks for vertical collision with the player.
+        - Iterates over the collidable sprites under the player (looked up on the tile grid),
+          and checks for vertical collision with the player.
         - Adjusts the player's position and movement based on the collision and tile type.
 
         Args:
@@ -429,13 +542,13 @@ class Level(Player):
         player = self.player.sprite
         player_state = Player.get_status(player)
 
-        for sprite in self.collidable_sprites:
+        for sprite in self.solid_tiles(player.rect):
             if sprite.rect.colliderect(player.rect):
 
                 if player.direction.y > 0 and player_state != "jump":
                     player.rect.bottom = sprite.rect.top
                     player.direction.y = 0
-                    if sprite in self.bounce_blocks:
+                    if sprite.flags & BOUNCY:
                         PlayerMovements.jump(player, -20)
 
                 elif player.direction.y < 0:
@@ -468,44 +581,52 @@ class Level(Player):
                 tile_info = AnimatedTile.get_information(sprite)
                 self.bumped = True
                 if tile_info[0] > 0:
-                    if tile_info[1] == "coin-block":
-                        self.coin = Coins((sprite.rect.centerx, sprite.rect.top - 30))
-                        self.coin_sprites.add(self.coin)
+                    if sprite.flags & COIN:
+                        self.particles.emit("coin", sprite.rect.centerx, sprite.rect.top - 30)
                         self.change_coins(1)
                     else:
-                        self.power_up = PowerUp(
+                        power_up = self.object_pools["power_up"].acquire(
                             (sprite.rect.centerx, sprite.rect.bottom - 30),
                             player_form,
                         )
-                        self.power_up_sprites.add(self.power_up)
+                        self.lifecycles.spawn(
+                            power_up, self.power_up_sprites, self.reap_power_up
+                        )
+                        self.track(POWER_UP, power_up.rect, power_up.slot)
 
                     player.rect.top = sprite.rect.bottom
                     player.direction.y = 1
                     AnimatedTile.bumped(sprite, -14)
+                    self.tile_grid.move(sprite)
+                    self.bumped_tiles.add(sprite)
 
-    def boss_player_collisions(self):
+    def boss_player_collisions(self, dt=1):
         """
         Handles collisions between the player and the boss.
 
         - Retrieves the player and boss sprites.
         - Retrieves the boss's status.
+        - Applies gravity to the boss, its fall is swept against the solid tiles like the player's.
         - Performs collision detection between the player and the boss.
         - Adjusts the player's position and triggers corresponding actions based on the collision.
 
         Args:
             self: The Level instance.
+            dt: The number of frames simulated.
 
         Returns:
             None
         """
         player = self.player.sprite
 
-        if self.boss:
+        if self.boss and self.boss_awake:
             boss = self.boss.sprite
             boss_state = Boss.get_status(boss)[0]
-            Boss.apply_gravity(boss)
+            distance = pixel_step(Boss.apply_gravity(boss, dt))
+            boss.rect.y += sweep(boss.rect, distance, 1, self.solid_tiles)
 
-            if boss.rect.colliderect(player.rect):
+            self.track(BOSS, boss.rect)
+            if len(self.broadphase.query(player.rect, BOSS)):
                 if player.rect.bottom <= boss.rect.top + 40:
                     print(boss_state)
                     if boss_state == "attack":
@@ -531,7 +652,8 @@ class Level(Player):
         Handles collisions between projectiles (boss fireballs) and the player.
 
         - Retrieves the boss, player, and fireball information.
-        - Checks if the player collides with a fireball.
+        - Checks if the player collides with a fireball: the fireball is found in the broadphase, then the masks of the
+          drawn fireball and player frame are tested.
         - Handles player invincibility and damage if applicable.
 
         Args:
@@ -542,18 +664,21 @@ class Level(Player):
         """
 
         player = self.player.sprite
-        if self.boss:
+        if self.boss and self.boss_awake:
             boss = self.boss.sprite
             fire_ball_coordinates = Boss.attack_particles(boss)
-
-            if not self.invincible:
-                if (
-                    fire_ball_coordinates[0]
-                    <= player.rect.right
-                    <= fire_ball_coordinates[0] + 120
-                    and fire_ball_coordinates[1] - 50
-                    <= player.rect.top
-                    <= fire_ball_coordinates[1] + 50
+            fire_ball_pos = (int(fire_ball_coordinates[0]), int(fire_ball_coordinates[1]))
+            self.track(FIREBALL, boss.fire_ball.get_rect(topleft=fire_ball_pos))
+
+            player_area = player.image.get_rect(topleft=player.rect.topleft)
+            if not self.invincible and len(self.broadphase.query(player_area, FIREBALL)):
+                # Pixel-accurate test of the drawn fireball against the drawn frame of the player
+                if player.mask.overlap(
+                    registry.mask(boss.fire_ball),
+                    (
+                        fire_ball_pos[0] - player.rect.left,
+                        fire_ball_pos[1] - player.rect.top,
+                    ),
                 ):
                     # Damages the player, and sets iframes if player is still alive
                     self.alive = PlayerMovements.damage(player)
@@ -569,7 +694,8 @@ class Level(Player):
 
         - Retrieves the boss sprite.
         - Applies gravity to the boss.
-        - Iterates over the collidable sprites and checks for collisions with the boss.
+        - Iterates over the collidable sprites under the boss (looked up on the tile grid),
+          and checks for collisions with the boss.
         - Adjusts the boss's position if a collision occurs.
 
         Args:
@@ -580,56 +706,69 @@ class Level(Player):
         """
         boss = self.boss.sprite
 
-        for sprite in self.collidable_sprites:
+        for sprite in self.solid_tiles(boss.rect):
             if sprite.rect.colliderect(boss.rect):
                 # Adjust boss position if colliding from above, so boss stands on tile
                 if boss.direction.y > 0:
                     boss.rect.bottom = sprite.rect.top
                     boss.direction.y = 0
 
-    def animate_objects(self):
+    def animate_objects(self, dt=1):
         """
         Animates objects in the game.
 
-        - Draws the coin sprites on the display surface if the coin sprites list is not empty.
-        - Updates the position of the coin object based on the world shift.
-        - Animates the coin while animation duration is greater than 0
-        - Empties the coin_sprites list if the coin animation duration reaches 0.
+        - Draws every power-up on the display surface (the dying ones blink).
+        - Animates a power-up if its animation duration is greater than 0.
+        - Ages a power-up after its rise, it blinks out once its lifetime is over.
+
+        - Draws the particles, then moves them in one batch (the coin pops, debris, dust and sparks).
 
-        - Draws the power-up sprites on the display surface if the power-up sprites list is not empty.
-        - Updates the position of the power-up object based on the world shift.
-        - Animates the power-up if the power-up animation duration is greater than 0.
+        - Reaps the dead objects (and the boss, once it fell out of the world).
 
         Args:
             self: The instance of the class that calls this method.
+            dt: The number of frames simulated.
 
         Returns:
             None
         """
-        if len(self.coin_sprites) != 0:
-            self.coin_sprites.draw(self.display_surface)
-            self.coin.update(self.world_shift)
-            if self.coin.duration > 0:
-                self.coin.animate(15)
-                self.coin.duration -= 1
+        self.camera.draw(
+            [power_up for power_up in self.power_up_sprites if power_up.shown()],
+            self.display_surface,
+        )
+        for power_up in self.power_up_sprites:
+            if power_up.duration > 0:
+                power_up.animate(1)
+                power_up.duration -= 1
+                self.track(POWER_UP, power_up.rect, power_up.slot)
             else:
-                self.coin_sprites.empty()
+                power_up.age(dt)
+
+        self.particles.draw(self.camera, self.display_surface)
+        self.particles.update(dt)
 
-        if len(self.power_up_sprites) != 0:
-            self.power_up_sprites.draw(self.display_surface)
-            self.power_up.update(self.world_shift)
-            if self.power_up.duration > 0:
-                self.power_up.animate(1)
-                self.power_up.duration -= 1
+        self.lifecycles.reap()
+
+    def reap_power_up(self, power_up):
+        """
+        Returns a reaped power up to its pool, and removes its broadphase box.
+        """
+        self.object_pools["power_up"].release(power_up)
+        self.track(POWER_UP, None, power_up.slot)
+
+    def reap_boss(self, boss):
+        """Removes the broadphase boxes of the reaped boss and its fireball."""
+        self.track(BOSS, None)
+        self.track(FIREBALL, None)
 
     def player_powerup_collisions(self):
         """
         Handles collisions between the player and power-ups.
 
         - Retrieves the player sprite and player size.
-        - Checks for collisions between the player and power-up sprites.
-        - Applies the corresponding power-up effect based on the player's size.
-        - Empties the power-up sprites group.
+        - Checks for collisions between the player and the power-ups, their boxes are looked up in the broadphase.
+        - Applies the corresponding power-up effect based on the player's size, for the first power-up touched.
+        - Removes that power-up from the power-up sprites group (the lifecycle manager returns it to its pool).
 
         Args:
             self: The Level instance.
@@ -639,21 +778,45 @@ class Level(Player):
         """
         player = self.player.sprite
         player_size = Player.get_status(player)[2]
-        power_ups = pygame.sprite.spritecollide(player, self.power_up_sprites, False)
+        power_ups = self.broadphase.query(player.rect, POWER_UP)
 
-        if power_ups:
+        if len(power_ups):
             if player_size == "big":
                 PlayerMovements.fire_power_up(player)
             elif player_size == "small":
                 PlayerMovements.grow(player)
 
-            self.power_up_sprites.empty()
+            power_up = self.object_pools["power_up"].objects[int(power_ups[0])]
+            self.power_up_sprites.remove(power_up)
+            self.track(POWER_UP, None, power_up.slot)
+
+    # The Level methods called when the player touches a trigger, by the kind of the trigger.
+    # The constrains only turn the enemies around (see EnemySwarm.set_patrols), they have no handler.
+    trigger_handlers = {"kill": "fall_off", "goal": "check_win"}
+
+    def check_triggers(self):
+        """
+        Looks up the triggers the player touches, and calls the handlers of their kinds, in the order they were added.
+        - Only the buckets of the trigger index under the player are looked at.
+        - A handler is called once, even if the player touches several triggers of its kind (e.g. two goal volumes).
+        """
+        handlers = {}
+        for trigger in self.triggers.query(self.player.sprite.rect):
+            handler = self.trigger_handlers.get(trigger.kind)
+            if handler is not None:
+                handlers[handler] = None
+        for handler in handlers:
+            getattr(self, handler)()
+
+    def fall_off(self):
+        """Kills the player, after falling into the kill plane below the screen."""
+        self.check_death(True)
 
     def check_death(self, died=False):
         """
         Checks if the player has died and initiates appropriate actions.
 
-        - Checks if the player has fallen off the screen or explicitly died.
+        - Checks if the player explicitly died (falling off the screen is the kill plane trigger, see fall_off).
         - Exits the level and loads the overworld.
         - Adjusts the player's lives count.
 
@@ -664,7 +827,7 @@ class Level(Player):
         Returns:
             None
         """
-        if self.player.sprite.rect.top > screen_height or died:
+        if died:
             self.player_form = "small"
             self.change_form(self.player_form)
             self.create_overworld(self.current_level, 0, player_size)
@@ -674,7 +837,7 @@ class Level(Player):
         """
         Checks if the player has reached the goal and initiates appropriate actions.
 
-        - Checks if the player collides with the goal sprites.
+        - It's the handler of the goal triggers, called when the player touches the goal.
         - Creates the overworld and unlocks the next level
 
         Args:
@@ -683,50 +846,159 @@ class Level(Player):
         Returns:
             None
         """
+        player_form = Player.get_status(self.player.sprite)[2]
+        self.change_form(player_form)
+        self.create_overworld(self.current_level, self.new_max_level, player_size)
+
+    def track(self, kind, rect, owner=0):
+        """
+        Keeps the broadphase box of a single entity (the boss, the fireball or a power up) on its rect.
+
+        Parameters:
+            kind (int): The kind of the entity (BOSS, FIREBALL or POWER_UP).
+            rect (pygame.Rect): The box of the entity in world coordinates, None removes the entity.
+            owner (int, optional): The index of the entity within its kind (the pool slot of a power up). Defaults to 0.
+        """
+        key = (kind, owner)
+        proxy = self.proxies.get(key)
+        if rect is None:
+            if proxy is not None:
+                self.broadphase.remove(self.proxies.pop(key))
+        elif proxy is None:
+            self.proxies[key] = self.broadphase.add(kind, owner, rect)
+        else:
+            self.broadphase.move(proxy, rect)
 
-        if pygame.sprite.spritecollide(self.player.sprite, self.goal_sprites, False):
-            player_form = Player.get_status(self.player.sprite)[2]
-            self.change_form(player_form)
-            self.create_overworld(self.current_level, self.new_max_level, player_size)
+    def solid_tiles(self, rect):
+        """
+        Finds the solid tiles overlapped by a rect.
+
+        Parameters:
+            rect (pygame.Rect): The rect to check, in world coordinates.
+
+        Returns:
+            tiles (list): The colliders of the base layer (TileCell) followed by the animated sprites, that overlap the rect.
+        """
+        return self.base_map.collide(rect) + self.tile_grid.collide(rect)
+
+    def set_base_tile(self, column, row, tile_id):
+        """
+        Changes a tile of the base layer (-1 removes it), e.g. for a breakable block.
+        - The colliders around the tile are merged again, and the baked chunks under it are drawn again.
+        - A removed tile breaks into brick debris.
+        - The patrol intervals of the enemies are computed again, an enemy may now walk past the tile.
+        """
+        if tile_id == -1 and self.base_map.tile(column, row) != -1:
+            self.particles.emit(
+                "debris", column * tile_size + tile_size // 2, row * tile_size + tile_size // 2
+            )
+        self.base_map.set_tile(column, row, tile_id)
+        self.terrain.invalidate(
+            pygame.Rect(column * tile_size, row * tile_size, tile_size, tile_size)
+        )
+        self.enemies.set_patrols(self.constrained, self.base_map.occupancy(SOLID), tile_size)
+
+    def update_bumped_tiles(self):
+        """
+        Re-indexes the bumped animated tiles on the tile grid, while they move back to their place.
+        - Tiles back in place are no longer tracked.
+        """
+        for sprite in list(self.bumped_tiles):
+            self.tile_grid.move(sprite)
+            if sprite.rect.y == sprite.pos[0]:
+                self.bumped_tiles.discard(sprite)
 
-    def run(self):
+    def update_activity(self):
+        """
+        Wakes the entities the view approached, and puts the ones left far behind back to sleep.
+        - The enemies wake up and sleep by their distance from the view (see EnemySwarm.update_activity).
+        - The boss wakes up once, when the view comes within settings.boss_wake_distance of it, and stays awake.
+        """
+        self.enemies.update_activity(self.camera)
+
+        if self.boss and not self.boss_awake:
+            boss = self.boss.sprite
+            if self.camera.x + self.camera.width + boss_wake_distance >= boss.rect.left:
+                self.boss_awake = True
+                Boss.wake(boss)
+
+    def visible_sprite_count(self):
+        """
+        Counts the enemies and animated tiles that were near the view in the last frame.
+        - The static layers are TileMaps drawn from their tile arrays, they aren't counted.
+
+        Returns:
+            tuple: The number of visible enemies and animated tiles, and the number of all of them.
+        """
+        layers = (self.enemies, self.animated_sprites)
+        visible = sum(layer.visible_count for layer in layers)
+        total = sum(len(layer) for layer in layers)
+        return visible, total
+
+    def entity_counts(self):
+        """
+        Counts the live entities, and the active and dormant ones (the enemies and the boss), for the debug counter of
+        the HUD.
+        - The live entities are the ones that weren't reaped yet (living or dying): the enemies that weren't despawned,
+          and the single entities of the lifecycle manager (power ups, boss).
+        - Particles are only visual, they aren't counted (see pool_stats).
+        - Despawned enemies aren't counted.
+
+        Returns:
+            tuple: The number of live, active and dormant entities.
+        """
+        active, dormant, despawned = self.enemies.activity_counts()
+        live = active + dormant + self.lifecycles.live_count()
+        if self.boss:
+            if self.boss_awake:
+                active += 1
+            else:
+                dormant += 1
+        return live, active, dormant
+
+    def pool_stats(self):
+        """
+        Returns the size, the number of objects in use and the high-water mark of every object pool, by kind, and of the
+        particle system, for the pool counter of the HUD.
+        """
+        stats = {kind: pool.stats() for kind, pool in self.object_pools.items()}
+        stats["particles"] = self.particles.stats()
+        return stats
+
+    def run(self, dt=1):
         """
         - Runs all processes of the Level class.
         - Updates and draws all tiles and other assets
+
+        Args:
+            dt: The number of frames to simulate (the moves are swept, so long steps don't pass through tiles).
         """
 
         # Background
         level_background_color = levels[self.current_level]["background_color"]
         self.display_surface.fill(level_background_color)
-        self.background_sprites.update(self.world_shift)
-        self.background_sprites.draw(self.display_surface)
-
-        # Base sprites
-        self.base_sprites.update(self.world_shift)
-        self.base_sprites.draw(self.display_surface)
+        self.background_map.draw_area(self.display_surface, self.camera.view())
 
-        # Goal sprites
-        self.goal_sprites.update(self.world_shift)
-        self.goal_sprites.draw(self.display_surface)
-        self.goal.update(self.world_shift)
+        # Base and goal sprites
+        self.terrain.draw(self.camera, self.display_surface)
 
         # Enemies sprites
+        self.update_activity()
         self.enemy_player_collision()
         self.enemy_collision_reverse()
-        self.goomba_sprites.draw(self.display_surface)
-        self.goomba_sprites.update(self.world_shift)
-        self.constrains_sprites.update(self.world_shift)
+        self.enemies.draw(self.camera, self.display_surface)
+        self.enemies.update(self.camera, dt)
 
         # Animated block sprites
-        self.animated_sprites.update(self.world_shift)
-        self.animated_sprites.draw(self.display_surface)
+        self.animated_sprites.update_visible(self.camera)
+        self.animated_sprites.draw_visible(self.camera, self.display_surface)
+        self.update_bumped_tiles()
 
         # Player
-        self.check_death()
-        self.check_win()
+        self.check_triggers()
         if self.alive:
-            self.horizontal_collisions()
-            self.player.sprite.apply_gravity()
+            self.horizontal_collisions(dt)
+            self.vertical_movement(dt)
             self.player_powerup_collisions()
             self.animated_collisions()
             self.projectile_collisions()
@@ -737,14 +1009,14 @@ class Level(Player):
             self.invincibility_timer()
 
             self.player.update()
-            self.player.draw(self.display_surface)
+            self.camera.draw(self.player, self.display_surface)
 
         # Object sprites
-        self.animate_objects()
+        self.animate_objects(dt)
 
         # Boss
-        if self.boss:
-            self.boss_player_collisions()
+        if self.boss and self.boss_awake:
+            self.boss_player_collisions(dt)
             self.boss_tile_collisions()
-            self.boss.update(self.world_shift)
-            self.boss.draw(self.display_surface)
+            self.boss.update()
+            self.camera.draw(self.boss, self.display_surface)
@@ -0,0 +1,240 @@
+"""
+This file compiles the level layers into a single binary file, and loads the levels from it.
+
+The compiled file contains:
+    - A header: the magic bytes, the format version and the length of the metadata.
+    - The metadata as JSON: the size of the level, the source files with their modification times,
+      the number of entities on every layer, the spawn points, and the merged colliders of the solid layers
+      (with the tile flags they were merged from).
+    - Every layer as a packed array of 16 bit integers, in the order listed by the metadata.
+
+The compiled file is rebuilt automatically when a source file, or the flags of a merged layer, change.
+The source is either the Tiled map (TMX) of the level, or the CSV files exported from it, one per layer.
+"""
+import json
+import os
+import struct
+import sys
+from array import array
+from support import import_csv_layout, import_tmx_layout
+from settings import boss_tile_id
+from tile_types import tile_types, merged_layers
+from tilemap import TileMap
+
+# Identifies a compiled level file, the version is raised whenever the layout of the file changes.
+magic = b"SPLV"
+version = 2
+header = struct.Struct("<4sHI")
+
+# The layers of a level, as named in game_data.py.
+layer_names = ("base", "animated", "background", "constrains", "enemies", "player", "goal")
+
+# Layers named differently in the TMX files, and the name they have in game_data.py.
+tmx_layer_names = {"mobs": "enemies"}
+
+# Non-numeric tile values exported from Tiled, and the tile ids they are stored as.
+tile_tokens = {"": -1, "B": boss_tile_id}
+
+
+class LevelLayout:
+    """
+    Represents the layout of a level, as loaded from its compiled file.
+
+    Attributes:
+        width (int): The number of columns of the level.
+        height (int): The number of rows of the level.
+        layers (dict): The layers of the level by name, each one a list of rows of tile ids (-1 is an empty tile).
+        entity_counts (dict): The number of non-empty tiles on every layer.
+        spawn_points (dict): The (column, row) of the player spawn, the level end and the boss (None if missing).
+        merged (dict): The merged colliders of the layers in tile_types.merged_layers, as [column, row, width, height]
+                       lists in cells (see TileMap).
+    """
+
+    def __init__(self, meta, layers):
+        self.width = meta["width"]
+        self.height = meta["height"]
+        self.entity_counts = meta["entity_counts"]
+        self.spawn_points = {
+            name: tuple(pos) if pos else None
+            for name, pos in meta["spawn_points"].items()
+        }
+        self.layers = layers
+        self.merged = {name: merged["rects"] for name, merged in meta["merged"].items()}
+
+
+def load_level(level_data):
+    """
+    Loads the layout of a level from its compiled file, compiling it first if it is missing or out of date.
+
+    Parameters:
+        level_data (dict): The data of the level from game_data.py.
+
+    Returns:
+        LevelLayout: The layout of the level.
+    """
+    if "tmx" in level_data:
+        sources = {"tmx": level_data["tmx"]}
+    else:
+        sources = {name: level_data[name] for name in layer_names}
+    compiled_path = level_data["compiled"]
+
+    try:
+        with open(compiled_path, "rb") as file:
+            data = file.read()
+        layout = read_compiled(data, sources)
+        if layout:
+            return layout
+    except (OSError, ValueError, KeyError, struct.error):
+        pass
+
+    data = compile_level(sources)
+    try:
+        temporary_path = compiled_path + ".tmp"
+        with open(temporary_path, "wb") as file:
+            file.write(data)
+        os.replace(temporary_path, compiled_path)
+    except OSError:
+        # The level can still be played from the freshly compiled data, it's just compiled again next time.
+        pass
+
+    return read_compiled(data, sources)
+
+
+def source_times(sources):
+    """Returns the modification times of the source files, keyed by the layer name."""
+    return {name: [path, os.stat(path).st_mtime_ns] for name, path in sources.items()}
+
+
+def read_compiled(data, sources):
+    """
+    Unpacks a compiled level.
+
+    Parameters:
+        data (bytes): The content of the compiled file.
+        sources (dict): The source files of the layers, used to check if the compiled file is up to date.
+
+    Returns:
+        LevelLayout: The layout of the level, or None if the compiled file is outdated.
+    """
+    file_magic, file_version, meta_length = header.unpack_from(data)
+    if file_magic != magic or file_version != version:
+        return None
+
+    meta_end = header.size + meta_length
+    meta = json.loads(data[header.size : meta_end])
+    if meta["sources"] != source_times(sources):
+        return None
+    for name, merged in meta["merged"].items():
+        if merged["flags"] != tile_types[name].flags(len(merged["flags"])):
+            return None
+
+    width, height = meta["width"], meta["height"]
+    values = array("h")
+    values.frombytes(memoryview(data)[meta_end:])
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    layers = {}
+    layer_size = width * height
+    for index, name in enumerate(meta["layers"]):
+        start = index * layer_size
+        layers[name] = [
+            values[row_start : row_start + width]
+            for row_start in range(start, start + layer_size, width)
+        ]
+
+    return LevelLayout(meta, layers)
+
+
+def compile_level(sources):
+    """
+    Parses the source files of a level, and packs them into the compiled format.
+    - A TMX file is read in a single pass, layers missing from it are left empty.
+
+    Parameters:
+        sources (dict): The source CSV files of the layers keyed by the layer name, or the TMX file keyed by "tmx".
+
+    Returns:
+        bytes: The content of the compiled file.
+    """
+    if "tmx" in sources:
+        tmx_layers = import_tmx_layout(sources["tmx"])
+        tmx_layers = {
+            tmx_layer_names.get(name, name): layout
+            for name, layout in tmx_layers.items()
+        }
+        layers = {name: tmx_layers.get(name, []) for name in layer_names}
+    else:
+        layers = {
+            name: [[tile_id(val) for val in row] for row in import_csv_layout(path)]
+            for name, path in sources.items()
+        }
+    return pack_level(layers, source_times(sources))
+
+
+def tile_id(val):
+    """Converts a tile value of a source file to its tile id."""
+    if val in tile_tokens:
+        return tile_tokens[val]
+    return int(val)
+
+
+def find_tile(layout, value):
+    """Returns the (column, row) of the first tile with the given id in a layer, or None."""
+    for row_index, row in enumerate(layout):
+        if value in row:
+            return row.index(value), row_index
+    return None
+
+
+def merge_layers(layers):
+    """Merges the tiles of the layers in tile_types.merged_layers into large colliders, with the flags they used."""
+    merged = {}
+    for name, merged_flags in merged_layers.items():
+        tile_map = TileMap(layers[name], types=tile_types[name], merged_flags=merged_flags)
+        merged[name] = {"flags": tile_map.flags.tolist(), "rects": tile_map.merged_rects()}
+    return merged
+
+
+def pack_level(layers, sources):
+    """
+    Packs the layers of a level and their metadata.
+
+    Parameters:
+        layers (dict): The layers of the level, each one a list of rows of tile ids.
+        sources (dict): The source files of the layers with their modification times.
+
+    Returns:
+        bytes: The content of the compiled file.
+    """
+    height = max(len(layout) for layout in layers.values())
+    width = max(len(row) for layout in layers.values() for row in layout)
+
+    values = array("h")
+    for layout in layers.values():
+        for row_index in range(height):
+            row = layout[row_index] if row_index < len(layout) else []
+            values.extend(row)
+            values.extend([-1] * (width - len(row)))
+    if sys.byteorder == "big":
+        values.byteswap()
+
+    meta = {
+        "width": width,
+        "height": height,
+        "layers": list(layers),
+        "sources": sources,
+        "entity_counts": {
+            name: sum(val != -1 for row in layout for val in row)
+            for name, layout in layers.items()
+        },
+        "spawn_points": {
+            "player": find_tile(layers["player"], 1),
+            "level_end": find_tile(layers["player"], 0),
+            "boss": find_tile(layers["enemies"], boss_tile_id),
+        },
+        "merged": merge_layers(layers),
+    }
+    meta = json.dumps(meta).encode()
+
+    return header.pack(magic, version, len(meta)) + meta + values.tobytes()
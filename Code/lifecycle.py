@@ -0,0 +1,74 @@
+# This file contains the lifecycle states of the entities, and the manager reaping the dead ones.
+# An entity is living until it's killed, dying while its death animation plays, and dead once it's over.
+# Dead entities (and entities that left the world bounds) are removed, so long levels don't accumulate dead work.
+
+# The entity is active, it moves and collides.
+LIVING = 0
+
+# The death animation of the entity plays (e.g. a squashed enemy, a blinking power up), it no longer collides.
+DYING = 1
+
+# The entity is done, it's removed on the next reap.
+DEAD = 2
+
+
+class LifecycleManager:
+    """
+    Tracks the lifecycle of the single entities of a level (the power ups, the boss), and reaps the dead ones.
+
+    - The entities are sprites with a life attribute (LIVING, DYING or DEAD), they set it themselves as they die
+      (see Object.die and Object.age).
+    - Reaping removes the entities that are dead, that left the world bounds (their top left corner is outside), or
+      that were taken out of their sprite group (e.g. a collected power up).
+    - The callback of a reaped entity is called with it, to release what the level holds for it (e.g. its broadphase box).
+
+    Attributes:
+        bounds (pygame.Rect): The world bounds, in world coordinates.
+        entities (dict): The sprite group and the callback of every tracked entity, in the order they were spawned.
+        reaped (int): The number of entities reaped so far.
+
+    Methods:
+        - spawn(entity, group, on_reap=None)
+        - reap()
+        - live_count()
+    """
+
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.entities = {}
+        self.reaped = 0
+
+    def __len__(self):
+        return len(self.entities)
+
+    def spawn(self, entity, group, on_reap=None):
+        """
+        Adds a living entity to its sprite group, and tracks it until it's reaped.
+
+        Parameters:
+            entity (pygame.sprite.Sprite): The entity, with a life attribute.
+            group (pygame.sprite.Group): The sprite group the entity is updated and drawn from.
+            on_reap (callable, optional): Called with the entity once it's reaped. Defaults to None.
+        """
+        entity.life = LIVING
+        group.add(entity)
+        self.entities[entity] = (group, on_reap)
+
+    def reap(self):
+        """Removes the dead entities, and the ones that left the world bounds or their sprite group."""
+        for entity, (group, on_reap) in list(self.entities.items()):
+            if (
+                entity.life == DEAD
+                or entity not in group
+                or not self.bounds.collidepoint(entity.rect.topleft)
+            ):
+                entity.life = DEAD
+                group.remove(entity)
+                del self.entities[entity]
+                self.reaped += 1
+                if on_reap is not None:
+                    on_reap(entity)
+
+    def live_count(self):
+        """Returns the number of tracked entities that aren't dead (living or dying)."""
+        return sum(entity.life != DEAD for entity in self.entities)
@@ -6,6 +6,7 @@ from overworld import Overworld, Icon
 from support import import_folder
 from UI import UI
 from menu import MainMenu
+from assets import registry
 
 
 class Game:
@@ -29,6 +30,10 @@ class Game:
         self.coins = 0
         self.form = "small"
 
+        # ASSETS
+        registry.preload("menu")
+        registry.preload("overworld")
+
         # MENU
         self.menu = MainMenu(screen, self.create_overworld)
         self.status = "menu"
@@ -56,6 +61,7 @@ class Game:
             - current_level (int): The index of the current level to create.
 
         """
+        registry.preload(current_level)
         self.level = Level(
             current_level,
             screen,
@@ -80,6 +86,7 @@ class Game:
         self.player_state = player_state
         if new_max_level > self.max_level:
             self.max_level = new_max_level
+        registry.preload("overworld")
         self.overworld = Overworld(
             current_level, self.max_level, screen, self.create_level, self.create_menu
         )
@@ -117,6 +124,7 @@ class Game:
         """
         Creates a new MainMenu instance, transitioning the game status to the main menu.
         """
+        registry.preload("menu")
         self.menu = MainMenu(screen, self.create_overworld)
         self.status = "menu"
 
@@ -133,9 +141,12 @@ class Game:
         elif self.status == "menu":
             self.menu.run()
         else:
-            self.level.run()
+            self.level.run(time_step)
             self.ui.show_lives(self.current_lives)
             self.ui.show_coins(self.coins)
+            self.ui.show_entity_counts(self.level.entity_counts())
+            self.ui.show_sprite_counts(self.level.visible_sprite_count())
+            self.ui.show_pool_stats(self.level.pool_stats())
 
 
 # Pygame Setup
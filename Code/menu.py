@@ -1,5 +1,6 @@
 import pygame
-from support import import_folder
+from assets import registry
+from frame_stream import frame_stream
 from settings import screen_width, screen_height
 
 
@@ -15,19 +16,32 @@ class MainMenu:
         Attributes:
             display_surface (pygame.Surface): The display surface where the main menu will be rendered.
             create_overworld (function): A function reference to create the overworld.
-            background_frames (list): A list of background frames for the main menu background animation.
-            bg_index (float): The current index of the background frame being displayed.
-            monitor_frames (list): A list of frames for the monitor animation.
-
+            background (FrameStream): The background animation of the main menu, streamed from disk at the screen size.
+            bg_index (float): The time elapsed since the background moved to its current frame, in frames.
+            monitor_frames (tuple): The frames for the monitor animation, scaled to the size of the monitor.
+            controls (pygame.Surface): The image of the controls.
+            menu_text_surface (pygame.Surface): The rendered menu text.
+            title (pygame.Surface): The title image.
+
+        Every surface is prepared here (the monitor frames are scaled once per process by the asset registry,
+        the background is decoded ahead by its stream), so drawing a menu frame is just blitting.
         """
         self.display_surface = screen
         self.create_overworld = create_overworld
 
         # Main Menu Background
-        self.background_frames = import_folder("../Menu/background_frames")
+        # The background is too large to keep in memory, only a few frames are decoded ahead.
+        # The stream is shared, reopening the menu continues the animation, instead of decoding it again.
+        self.background = frame_stream(
+            "../Menu/background_frames", (screen_width, screen_height)
+        )
         self.bg_index = 0
-        self.monitor_frames = import_folder("../Menu/monitor_frames")
-        self.controls = pygame.image.load("../Menu/controls.png")
+        self.monitor_frames = registry.scaled_folder("../Menu/monitor_frames", (190, 165))
+        self.controls = registry.image("../Menu/controls.png")
+
+        # Menu text and title
+        self.menu_text_surface = self.render_menu_text()
+        self.title = registry.image("../Menu/menu_title.png")
 
     def draw_background(self):
         """
@@ -35,25 +49,24 @@ class MainMenu:
         - The background is cycled through with a slight animation.
         """
         self.bg_index += 0.2
-        if self.bg_index >= len(self.background_frames):
-            self.bg_index = 0
-        image = pygame.transform.scale(
-            self.background_frames[int(self.bg_index)], (screen_width, screen_height)
-        )
-        self.display_surface.blit(image, (0, 0))
+        if self.bg_index >= 1:
+            self.bg_index -= 1
+            self.background.advance()
 
+        self.display_surface.blit(self.background.current(), (0, 0))
         self.display_surface.blit(
-            pygame.transform.scale(self.monitor_frames[int(self.bg_index)], (190, 165)),
-            (520, 535),
+            self.monitor_frames[self.background.index], (520, 535)
         )
 
-    def draw_menu_text(self):
+    def render_menu_text(self):
         """
-        Draws the menu text on the main menu.
-        - The menu text prompts the player to "press space" to start the game.
+        Renders the menu text once, it is blitted by draw_menu_text every frame.
+
+        Returns:
+            menu_text_surface (pygame.Surface): The rendered menu text.
         """
-        self.menu_text_surface = pygame.surface.Surface((820, 200), pygame.SRCALPHA)
-        self.menu_font = pygame.font.Font("../Packages/Fonts/Super-Mario-Bros.ttf", 40)
+        menu_text_surface = pygame.surface.Surface((820, 200), pygame.SRCALPHA)
+        self.menu_font = registry.font("../Packages/Fonts/Super-Mario-Bros.ttf", 40)
 
         self.menu_text = self.menu_font.render(
             "press space to start",
@@ -66,9 +79,15 @@ class MainMenu:
             "White",
         )
 
-        self.menu_text_surface.blit(self.menu_text, (60, 10))
-        self.menu_text_surface.blit(self.control_text, (20, 60))
+        menu_text_surface.blit(self.menu_text, (60, 10))
+        menu_text_surface.blit(self.control_text, (20, 60))
+        return menu_text_surface
 
+    def draw_menu_text(self):
+        """
+        Draws the menu text on the main menu.
+        - The menu text prompts the player to "press space" to start the game.
+        """
         self.display_surface.blit(
             self.menu_text_surface, (screen_width / 2 - 400, screen_height - 130)
         )
@@ -76,9 +95,8 @@ class MainMenu:
     def draw_menu_title(self):
         """
         Draws the title image on the main menu.
-        - The title image is loaded and displayed at the top center of the main menu.
+        - The title image is displayed at the top center of the main menu.
         """
-        self.title = pygame.image.load("../Menu/menu_title.png")
         self.display_surface.blit(self.title, (screen_width / 2 - 200, 80))
 
     def get_input(self):
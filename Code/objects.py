@@ -1,59 +1,69 @@
 import pygame
-from player import Player
+from assets import registry
+from lifecycle import LIVING, DYING, DEAD
+from settings import power_up_lifetime, blink_time
 
 
 class Object(pygame.sprite.Sprite):
     """
     Represents a basic game object.
 
-    - This class extends the pygame.sprite.Sprite and provides the foundation for other game objects by handling animation
-      and updating their positions on the screen.
+    - This class extends the pygame.sprite.Sprite and provides the foundation for other game objects by handling animation.
+    - Objects have a lifecycle (see lifecycle.py), they are reaped by the LifecycleManager of the level once dead.
 
     - Attributes:
         rect: A pygame.Rect representing the position and size of the object.
+        life: The lifecycle state of the object (LIVING, DYING or DEAD).
+        lifetime: The number of frames left until the object starts dying, None if it lives until it's killed.
+        dying_time: The number of frames left of the death animation (the object blinks).
 
     - Methods:
-        __init__(self, pos): Initializes the object with a given position.
+        __init__(self, pos, lifetime=None): Initializes the object with a given position and lifetime.
+        revive(self, lifetime=None): Resets the lifecycle of the object, when it's spawned again from its pool.
         animate(self, speed): Animates the object by moving it upward based on the specified speed.
-        update(self, shift): Updates the object's position by moving it horizontally, when screen-scrolling.
+        die(self, duration=0): Starts the death animation of the object, it's dead at once without a duration.
+        age(self, dt=1): Counts down the lifetime or the death animation of the object.
+        shown(self): Returns False on the frames the dying object blinks out.
     """
 
-    def __init__(self, pos):
+    def __init__(self, pos, lifetime=None):
         super().__init__()
         self.rect = pygame.Rect(pos, (0, 0))
+        self.revive(lifetime)
+
+    def revive(self, lifetime=None):
+        """Resets the lifecycle of the object, when it's spawned again from its pool."""
+        self.life = LIVING
+        self.lifetime = lifetime
+        self.dying_time = 0
 
     def animate(self, speed):
         """Animates the object by moving it upward based on the specified speed."""
         self.rect.y += -1 * speed
 
-    def update(self, shift):
-        """Updates the object's horizontal position based on the given shift value."""
-        self.rect.x += shift
-
-
-class Coins(Object):
-    """
-    Represents a coin object in the game.
-
-    This class extends the Object class and adds attributes and behavior specific to coins.
-
-    Attributes:
-        - duration: The duration for which the coin remains active.
-        - image: The image of the coin.
-        - rect: A pygame.Rect representing the position and size of the coin.
-
-    Methods:
-        - __init__(self, pos): Initializes the coin at the specified position.
-        - Methods of the Object class
-    """
-
-    def __init__(self, pos):
-        super().__init__(pos)
-        self.duration = 4
-        self.image = pygame.image.load("../Packages/Textures/map/objects/coin.png")
-        self.image.set_colorkey((0, 0, 0))
-        self.rect = self.image.get_rect()
-        self.rect.centerx, self.rect.centery = pos
+    def die(self, duration=0):
+        """Starts the death animation of the object, it's dead once the duration (in frames) is over."""
+        self.life = DYING if duration > 0 else DEAD
+        self.dying_time = duration
+
+    def age(self, dt=1):
+        """
+        Counts down the lifetime of the living object, and the death animation of the dying object.
+        - The object starts blinking out once its lifetime is over, and it's dead after settings.blink_time frames.
+        """
+        if self.life == LIVING:
+            if self.lifetime is not None:
+                self.lifetime -= dt
+                if self.lifetime <= 0:
+                    self.die(blink_time)
+        elif self.life == DYING:
+            self.dying_time -= dt
+            if self.dying_time <= 0:
+                self.life = DEAD
+
+    def shown(self):
+        """Returns False on the frames the dying object blinks out (every other 4 frames)."""
+        return self.life != DYING or int(self.dying_time) // 4 % 2 == 0
 
 
 class PowerUp(Object):
@@ -63,27 +73,103 @@ class PowerUp(Object):
     This class extends the Object class and adds attributes and behavior specific to power-ups.
 
     Attributes:
-        - duration: The duration for which the power-up remains active.
+        - duration: The duration of the rise of the power-up out of its block.
+        - lifetime: The number of frames the power-up waits to be collected after its rise (settings.power_up_lifetime).
         - image: The image of the power-up.
         - rect: A pygame.Rect representing the position and size of the power-up.
+        - slot: The index of the power-up in its ObjectPool, the owner of its broadphase box.
 
     Methods:
         - __init__(self, pos, player_size): Initializes the power-up at the specified position and for a given player size.
+        - reset(self, pos, player_size): Spawns the power-up again, when it's handed out by its pool.
         - Methods of the Object class.
     """
 
     def __init__(self, pos, player_size):
-        super().__init__(pos)
+        super().__init__(pos, power_up_lifetime)
+        self.reset(pos, player_size)
+
+    def reset(self, pos, player_size):
+        """Spawns the power-up again at the specified position and for a given player size, when it's handed out by its pool."""
+        self.revive(power_up_lifetime)
         if player_size == "small":
-            self.image = pygame.image.load(
-                "../Packages/Textures/map/objects/mushroom.png"
+            self.image = registry.image(
+                "../Packages/Textures/map/objects/mushroom.png", (0, 0, 0)
             )
         else:
-            self.image = pygame.image.load(
-                "../Packages/Textures/map/objects/fire-flower.png"
+            self.image = registry.image(
+                "../Packages/Textures/map/objects/fire-flower.png", (0, 0, 0)
             )
 
         self.duration = 60
-        self.image.set_colorkey((0, 0, 0))
-        self.rect = self.image.get_rect()
+        self.rect.size = self.image.get_size()
         self.rect.centerx, self.rect.centery = pos
+
+
+class ObjectPool:
+    """
+    Preallocated objects of one type (e.g. the power ups), handed out on spawn and returned once they are reaped.
+
+    - The objects are created when the level is loaded, spawning one resets a free object (see PowerUp.reset) instead
+      of creating it, so a bump-heavy section allocates nothing, and the textures come from the asset registry.
+    - Every object gets a slot, its index in the pool, e.g. the owner of its box in the broadphase.
+    - If every object is in use, the pool grows by one object. The pool size, the high-water mark and the growth are
+      kept, so the sizes in settings.object_pool_sizes can be tuned.
+
+    Attributes:
+        - factory: Creates a new object of the pool.
+        - objects: Every object of the pool, by slot.
+        - free: The objects ready to be handed out.
+        - size: The number of objects of the pool (free and in use).
+        - used: The objects handed out, and not returned yet.
+        - high_water: The largest number of objects in use at once.
+        - grown: The number of objects created after the preallocation, because the pool ran dry.
+
+    Methods:
+        - __init__(self, factory, size): Preallocates the objects of the pool.
+        - create(self): Creates a new object of the pool, in the next slot.
+        - acquire(self, *args): Hands out a free object, reset with the arguments.
+        - release(self, obj): Returns an object to the pool.
+        - stats(self): Returns the size, the objects in use and the high-water mark of the pool.
+    """
+
+    def __init__(self, factory, size):
+        self.factory = factory
+        self.objects = []
+        for _ in range(size):
+            self.create()
+        self.free = list(self.objects)
+        self.size = size
+        self.used = set()
+        self.high_water = 0
+        self.grown = 0
+
+    def create(self):
+        """Creates a new object of the pool, in the next slot."""
+        obj = self.factory()
+        obj.slot = len(self.objects)
+        self.objects.append(obj)
+        return obj
+
+    def acquire(self, *args):
+        """Hands out a free object, reset with the arguments (the arguments of its reset method)."""
+        if self.free:
+            obj = self.free.pop()
+        else:
+            obj = self.create()
+            self.size += 1
+            self.grown += 1
+        obj.reset(*args)
+        self.used.add(obj)
+        self.high_water = max(self.high_water, len(self.used))
+        return obj
+
+    def release(self, obj):
+        """Returns an object to the pool (e.g. once the lifecycle manager reaped it), it's handed out again later."""
+        if obj in self.used:
+            self.used.remove(obj)
+            self.free.append(obj)
+
+    def stats(self):
+        """Returns the size, the number of objects in use and the high-water mark of the pool."""
+        return self.size, len(self.used), self.high_water
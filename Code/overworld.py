@@ -1,6 +1,7 @@
 import pygame
 from game_data import levels
 from support import import_folder
+from assets import registry
 from settings import screen_width, screen_height
 
 
@@ -49,10 +50,9 @@ class Icon(pygame.sprite.Sprite):
         """
         super().__init__()
         self.pos = pos
-        self.image = pygame.image.load(
-            "../Packages/Textures/player/mario/small/idle/mario.png"
+        self.image = registry.image(
+            "../Packages/Textures/player/mario/small/idle/mario.png", (0, 0, 0)
         )
-        self.image.set_colorkey((0, 0, 0))
         self.rect = self.image.get_rect(center=pos)
 
     def update(self):
@@ -113,7 +113,7 @@ class Overworld:
         self.screen_width = screen_width
         self.screen_height = screen_height
         self.create_menu = create_menu
-        self.controls = pygame.image.load("../OverWorld/overworld_controls.png")
+        self.controls = registry.image("../OverWorld/overworld_controls.png")
 
     def setup_nodes(self):
         """
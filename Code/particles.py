@@ -0,0 +1,199 @@
+import numpy as np
+import pygame
+from settings import particle_capacity, particle_effects
+
+
+def circle_frames(color, radii):
+    """
+    Draws the frames of a round particle (e.g. dust, sparks), one frame per radius, fading out frame by frame.
+
+    Parameters:
+        color (tuple): The RGB color of the particle.
+        radii (tuple): The radius of every frame, in pixels.
+
+    Returns:
+        frames (list): The frames, as surfaces with per-pixel alpha.
+    """
+    frames = []
+    for index, radius in enumerate(radii):
+        alpha = 255 - 200 * index // max(len(radii) - 1, 1)
+        frame = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(frame, (*color, alpha), (radius, radius), radius)
+        frames.append(frame)
+    return frames
+
+
+def quarter_frames(texture):
+    """Cuts a texture into its four quarters (e.g. the debris of a brick), as subsurfaces sharing its pixels."""
+    width, height = texture.get_width() // 2, texture.get_height() // 2
+    return [
+        texture.subsurface((x, y, width, height))
+        for y in (0, height)
+        for x in (0, width)
+    ]
+
+
+class ParticleSystem:
+    """
+    Represents every particle of a level (coin pops, brick debris, stomp dust, fire sparks), simulated together on
+    preallocated NumPy arrays (one array per attribute).
+
+    - A particle is an index into the arrays. The live particles are kept packed at the front of the arrays, dead ones
+      are dropped by compacting the arrays once per update, so the arrays are never reallocated while particles come
+      and go.
+    - The effects of settings.particle_effects are spawned by emit(), every emission spawns a burst of particles with
+      random velocities in the ranges of the effect. The frames of the effects are passed in by name.
+    - Moving, aging and animating the particles is a handful of array operations per frame, however many are alive.
+      Drawing is the only per-particle loop, it blits the particles in the view in one batch.
+    - Particles are only visual, they don't collide with anything.
+
+    Attributes:
+        frames (list): The frames of every effect, in one list.
+        effects (dict): The specification of every effect, with the first frame and the number of frames of the effect.
+        capacity (int): The number of particles the arrays hold.
+        count (int): The number of live particles.
+        high_water (int): The largest number of particles alive at once.
+        dropped (int): The number of particles that weren't spawned, because the arrays were full.
+        x, y (array): The position of the center of the particles, in world coordinates.
+        speed_x, speed_y (array): The velocity of the particles, in pixels per frame.
+        gravity (array): The vertical acceleration of the particles.
+        age, lifetime (array): The number of frames the particles have lived, and will live.
+        first_frame, frame_count (array): The animation of the particles in the frames (one frame if it's random).
+        frame (array): The frame the particles show.
+        half_width, half_height (array): Half the size of every frame, to draw the particles around their center.
+
+    Methods:
+        - emit(name, x, y)
+        - update(dt=1)
+        - draw(camera, surface)
+        - stats()
+    """
+
+    float_fields = ("x", "y", "speed_x", "speed_y", "gravity", "age", "lifetime")
+    int_fields = ("first_frame", "frame_count", "frame")
+
+    def __init__(self, frames, specifications=particle_effects, capacity=particle_capacity):
+        self.frames = []
+        self.effects = {}
+        for name, specification in specifications.items():
+            effect = dict(specification)
+            effect["first_frame"] = len(self.frames)
+            effect["frame_count"] = len(frames[name])
+            self.frames.extend(frames[name])
+            self.effects[name] = effect
+        self.half_width = np.array([frame.get_width() // 2 for frame in self.frames], dtype=np.int64)
+        self.half_height = np.array([frame.get_height() // 2 for frame in self.frames], dtype=np.int64)
+
+        self.capacity = capacity
+        self.count = 0
+        self.high_water = 0
+        self.dropped = 0
+        self.random = np.random.default_rng()
+        for name in self.float_fields:
+            setattr(self, name, np.zeros(capacity, dtype=np.float64))
+        for name in self.int_fields:
+            setattr(self, name, np.zeros(capacity, dtype=np.int64))
+
+    def __len__(self):
+        return self.count
+
+    def emit(self, name, x, y):
+        """
+        Spawns a burst of particles of an effect.
+
+        Parameters:
+            name (str): The name of the effect, in settings.particle_effects.
+            x (int): The world x-coordinate of the emission point.
+            y (int): The world y-coordinate of the emission point.
+        """
+        effect = self.effects[name]
+        first = self.count
+        count = min(effect["count"], self.capacity - first)
+        self.dropped += effect["count"] - count
+        if count <= 0:
+            return
+        last = first + count
+        self.count = last
+        self.high_water = max(self.high_water, last)
+
+        uniform = self.random.uniform
+        spread = effect["spread"]
+        self.x[first:last] = x + uniform(-spread, spread, count)
+        self.y[first:last] = y + uniform(-spread, spread, count)
+        self.speed_x[first:last] = uniform(*effect["speed_x"], count)
+        self.speed_y[first:last] = uniform(*effect["speed_y"], count)
+        self.gravity[first:last] = effect["gravity"]
+        self.age[first:last] = 0
+        self.lifetime[first:last] = effect["lifetime"]
+
+        if effect["animation"] == "random":
+            self.first_frame[first:last] = effect["first_frame"] + self.random.integers(
+                0, effect["frame_count"], count
+            )
+            self.frame_count[first:last] = 1
+        else:
+            self.first_frame[first:last] = effect["first_frame"]
+            self.frame_count[first:last] = effect["frame_count"]
+        self.frame[first:last] = self.first_frame[first:last]
+
+    def update(self, dt=1):
+        """
+        Moves, ages and animates the live particles, and drops the ones whose lifetime is over.
+
+        Parameters:
+            dt (float, optional): The number of frames simulated. Defaults to 1.
+        """
+        n = self.count
+        if not n:
+            return
+
+        self.x[:n] += self.speed_x[:n] * dt
+        self.y[:n] += self.speed_y[:n] * dt
+        self.speed_y[:n] += self.gravity[:n] * dt
+        self.age[:n] += dt
+
+        # Animation, the frames are played over the lifetime
+        frame_count = self.frame_count[:n]
+        step = (self.age[:n] * frame_count / self.lifetime[:n]).astype(np.int64)
+        self.frame[:n] = self.first_frame[:n] + np.minimum(step, frame_count - 1)
+
+        # Drop the dead particles, the live ones are packed at the front of the arrays
+        alive = self.age[:n] < self.lifetime[:n]
+        if not alive.all():
+            kept = int(np.count_nonzero(alive))
+            for name in self.float_fields + self.int_fields:
+                array = getattr(self, name)
+                array[:kept] = array[:n][alive]
+            self.count = kept
+
+    def draw(self, camera, surface):
+        """
+        Draws the live particles in the view, around their center.
+
+        Parameters:
+            camera (Camera): The camera of the level.
+            surface (pygame.Surface): The surface to draw upon.
+        """
+        n = self.count
+        if not n:
+            return
+
+        frame = self.frame[:n]
+        x = self.x[:n].astype(np.int64) - self.half_width[frame] - camera.x
+        y = self.y[:n].astype(np.int64) - self.half_height[frame]
+        visible = (x > -2 * self.half_width[frame]) & (x < camera.width)
+
+        frames = self.frames
+        surface.blits(
+            [
+                (frames[index], (left, top))
+                for index, left, top in zip(
+                    frame[visible].tolist(), x[visible].tolist(), y[visible].tolist()
+                )
+            ],
+            False,
+        )
+
+    def stats(self):
+        """Returns the capacity, the number of live particles and the high-water mark of the system."""
+        return self.capacity, self.count, self.high_water
@@ -1,5 +1,6 @@
 import pygame
 from support import import_folder, import_states
+from assets import registry
 import settings
 
 
@@ -17,9 +18,12 @@ class Player(pygame.sprite.Sprite):
             last_attack_time = Tracks when the player last attacked
             combo_treshold: The maximum amount of time that can elapse between combo attacks.
             dispaly_surface: The surface, the Player should be displayed upon
+            alpha: The alpha of the displayed frames, lowered while the player is invincible
+            camera: The camera of the level, used to draw the particles at their screen position
 
         - Particles
             particle_pos: The coordinates of the particle
+            particle_image: The attack particle drawn in the last frame (None if the player isn't attacking)
             particle_speed: The move speed of the attack particles
 
         - Player Movement
@@ -41,6 +45,7 @@ class Player(pygame.sprite.Sprite):
         - Initial:
             self.image: The image of the player.
             self.rect: The hitbox of the player.
+            self.mask: The collision mask of the displayed frame, for pixel-accurate hits (drawn at rect.topleft).
 
     Methods:
         import_character_asstes(self)
@@ -52,7 +57,7 @@ class Player(pygame.sprite.Sprite):
         update(self)
     """
 
-    def __init__(self, pos, surface):
+    def __init__(self, pos, surface, camera):
 
         super().__init__()
 
@@ -64,11 +69,13 @@ class Player(pygame.sprite.Sprite):
         self.last_attack_time = 0
         self.combo_treshold = 70
         self.dispaly_surface = surface
+        self.alpha = 255
+        self.camera = camera
 
         # Player Movement
         self.direction = pygame.math.Vector2(0, 0.01)
         self.position = pygame.math.Vector2(pos[0], pos[1])
-        self.speed = 5
+        self.speed = 8
         self.gravity = 0.6
         self.jump_speed = -20
 
@@ -83,6 +90,7 @@ class Player(pygame.sprite.Sprite):
 
         # Particles
         self.particle_pos = (0, 0)
+        self.particle_image = None
         self.particle_speed = 80
 
         # Import assets
@@ -91,6 +99,7 @@ class Player(pygame.sprite.Sprite):
             self.forms[self.form]["idle"][self.frame_index], self.player_size
         )
         self.rect = self.image.get_rect(bottomleft=pos)
+        self.mask = registry.mask(self.image)
 
     def import_character_asstes(
         self,
@@ -105,10 +114,16 @@ class Player(pygame.sprite.Sprite):
             particles_dir (str): The directory path for attack particles (default is "Packages/Textures/particles/").
         """
         # Import character assets
-        self.forms = import_states(character_dir)
+        self.forms = import_states(character_dir, (0, 0, 0))
 
         # Import attack particles
-        self.attack_part = import_folder(particles_dir)
+        self.attack_part = import_folder(particles_dir, (0, 0, 0))
+
+        # The masks of every frame and particle, and of their mirrored variants, for pixel-accurate hits
+        for form in self.forms.values():
+            for animation in form.values():
+                registry.prepare_masks(animation)
+        registry.prepare_masks(self.attack_part)
 
     def animate(self):
         """
@@ -117,7 +132,8 @@ class Player(pygame.sprite.Sprite):
         The method adjusts animation speed and particle speed during attacks. It precomputes the animation sequence to avoid
         repeated dictionary lookups. The frame index wraps around the animation sequence for smooth looping.
 
-        If the player faces left, the image is flipped horizontally. The final image is set for display.
+        If the player faces left, the mirrored frame is used, and while invincible the translucent frame, both are
+        derived once by the asset registry. The final image is set for display, with the mask of the frame.
         """
         if self.animation_lock:
             self.status = "attack_" + str(self.combo_count)
@@ -136,14 +152,10 @@ class Player(pygame.sprite.Sprite):
 
         image = animation[int(self.frame_index)]
 
-        if self.facing_right:
-            self.image = image
-
-        else:
-            flipped_image = pygame.transform.flip(image, True, False)
-            flipped_image.set_colorkey((0, 0, 0))
-            self.image = flipped_image
-        self.image.set_colorkey((0, 0, 0))
+        if not self.facing_right:
+            image = registry.flipped(image)
+        self.mask = registry.mask(image)
+        self.image = registry.faded(image, self.alpha)
 
     def attack_particles(self):
         """
@@ -153,9 +165,9 @@ class Player(pygame.sprite.Sprite):
         - corresponding attack particle from the attack_part list based on the current combo count.
 
         - The particle's position is set based on the player's facing direction. If facing right, the particle appears on the
-        - left side of the player; otherwise, it appears on the right side after being flipped horizontally.
+        - left side of the player; otherwise, it appears on the right side, using the mirrored particle.
 
-        - The particle's colorkey is set to make the background transparent, and it is blitted on the display surface.
+        - The particles are loaded with a colorkey to make the background transparent, and blitted on the display surface.
         """
         if "attack" in self.status:
             particle = self.attack_part[self.combo_count - 1]
@@ -170,10 +182,14 @@ class Player(pygame.sprite.Sprite):
                     self.rect.centerx - 100 + self.particle_speed,
                     self.rect.centery - 10,
                 ]
-                particle = pygame.transform.flip(particle, True, False)
+                particle = registry.flipped(particle)
 
-            particle.set_colorkey((0, 0, 0))
-            self.dispaly_surface.blit(particle, self.particle_pos)
+            self.particle_image = particle
+            self.dispaly_surface.blit(
+                particle, self.camera.to_screen(self.particle_pos)
+            )
+        else:
+            self.particle_image = None
 
     def get_input(self):
         """
@@ -274,15 +290,25 @@ class Player(pygame.sprite.Sprite):
         """
         return self.status, self.facing_right, self.form
 
-    def apply_gravity(self):
+    def apply_gravity(self, dt=1):
         """
         - Applies gravity to the player's vertical movement.
         - The method efficiently updates the player's y-direction by adding the gravity value to it, which simulates the effect
-        - of gravity on the player's movement. It then updates the player's vertical position accordingly.
+        - of gravity on the player's movement.
+        - The move over dt frames is the sum of dt single-frame steps (speed += gravity, then move by the speed), so the
+          jump height and the fall don't depend on the time step.
+        - The player isn't moved here, the level sweeps the move against the tiles (see Level.vertical_movement).
+
+        Parameters:
+            dt (float, optional): The number of frames simulated. Defaults to 1.
+
+        Returns:
+            float: The vertical move of the player in pixels.
         """
 
-        self.direction.y += self.gravity
-        self.rect.y += self.direction.y
+        distance = self.direction.y * dt + self.gravity * dt * (dt + 1) / 2
+        self.direction.y += self.gravity * dt
+        return distance
 
     def update(self):
         """
@@ -10,9 +10,116 @@ tile_size = 64
 screen_height = 900
 screen_width = 1600
 
+# Width of the column chunks the level sprites are bucketed into, only the chunks near the view are updated and drawn.
+chunk_width = 8 * tile_size
+
+# Extra distance around the view, in pixels, where sprites are still updated and drawn.
+view_margin = 4 * tile_size
+
+# Distance from the view, in pixels, where dormant enemies wake up (like the classic spawn-on-approach).
+wake_distance = 4 * tile_size
+
+# Distance from the view, in pixels, where active enemies are put back to sleep (dying ones are reaped).
+# It's larger than the wake distance, so an enemy near the edge doesn't wake and sleep every frame.
+sleep_distance = 16 * tile_size
+
+# Distance from the view, in pixels, where the boss wakes up (it stays dormant until its arena is reached).
+boss_wake_distance = 2 * tile_size
+
+# Number of frames a stumped (squashed) enemy stays on screen, before it's removed.
+squash_time = 30
+
+# Number of frames a power up waits to be collected after rising out of its block, before it starts blinking out.
+power_up_lifetime = 10 * 60
+
+# Number of frames an expiring object blinks for, before it's removed.
+blink_time = 90
+
+# Number of objects preallocated per level, by kind. Spawning an object hands out a pooled one, the pools only grow
+# (one object at a time) if a section spawns more at once, the growth shows on the pool counter of the HUD.
+object_pool_sizes = {"power_up": 4}
+
+# Number of particles the particle system of a level holds at once, the particles of an effect past it are dropped.
+particle_capacity = 1024
+
+# Tile id of the brick in the terrain sheet, the brick debris particles are cut from its texture.
+debris_tile_id = 53
+
+# The particle effects, every emission spawns count particles at once:
+#   - speed_x, speed_y: the range of the initial velocity of the particles, in pixels per frame
+#   - gravity: added to the vertical velocity every frame
+#   - lifetime: the number of frames the particles live
+#   - spread: the largest distance of the particles from the emission point, in pixels
+#   - animation: "lifetime" plays the frames of the effect over the lifetime, "random" shows one random frame
+particle_effects = {
+    "coin": {
+        "count": 1,
+        "speed_x": (0, 0),
+        "speed_y": (-15, -15),
+        "gravity": 0,
+        "lifetime": 5,
+        "spread": 0,
+        "animation": "lifetime",
+    },
+    "debris": {
+        "count": 4,
+        "speed_x": (-6, 6),
+        "speed_y": (-16, -8),
+        "gravity": 0.8,
+        "lifetime": 60,
+        "spread": 16,
+        "animation": "random",
+    },
+    "dust": {
+        "count": 6,
+        "speed_x": (-3, 3),
+        "speed_y": (-1.5, 0),
+        "gravity": 0,
+        "lifetime": 20,
+        "spread": 12,
+        "animation": "lifetime",
+    },
+    "sparks": {
+        "count": 12,
+        "speed_x": (-6, 6),
+        "speed_y": (-8, 2),
+        "gravity": 0.4,
+        "lifetime": 25,
+        "spread": 8,
+        "animation": "lifetime",
+    },
+}
+
+# Shows the number of live, active and dormant entities on the HUD, and the number of sprites near the view, for debugging.
+show_entity_counter = False
+
+# Shows the size, the objects in use and the high-water mark of the object pools and the particle system on the HUD,
+# for tuning their sizes.
+show_pool_counter = False
+
+# Number of frames the level is simulated for, every time it's run (larger steps fast-forward the game, e.g. for headless runs).
+time_step = 1
+
+# Deepest overlap, in pixels, a swept move can end in with the first tile in its path (the collision handling then pushes
+# the entity back out). It's smaller than a tile, so however long a time step is, a move never passes through a tile.
+sweep_skin = tile_size // 2
+
+# Size of the surfaces the static layers are pre-rendered into, and the number of them kept in memory.
+baked_chunk_size = (16 * tile_size, vertical_tile_number * tile_size)
+baked_chunk_limit = 6
+
+# Number of quantized angles in the rotation table of a frame (72 steps of 5 degrees).
+rotation_steps = 72
+
+# Alpha of the player's frames while invincible after taking damage.
+invincible_alpha = 140
+
 # Size of the player's sprite (width, height).
 player_size = (42, 60)
 
+# Tile id of the boss on the enemies layer (exported as "B" from Tiled).
+boss_tile_id = -2
+
 # List of tuples representing enemy sprites' data.
 # Each tuple contains information like the starting frame index, vertical position, width, height, frame count, and name of the enemy sprite.
 enemy_tile_list = [
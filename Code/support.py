@@ -1,55 +1,47 @@
 import pygame
+import base64
+import sys
+import zlib
+from array import array
+from bisect import bisect_right, insort
 from csv import reader
+from functools import lru_cache
+from xml.etree import ElementTree
 from settings import tile_size, enemy_tile_list
-import os
+from assets import registry
 
+# The upper bits of a global tile id in a TMX file are flip flags, this mask removes them.
+tmx_gid_mask = 0x0FFFFFFF
 
-def import_states(path):
+
+def import_states(path, colorkey=None):
     """
     Imports a collection of character states (animations) from the specified path.
+    - The frames are loaded through the asset registry, so every state folder is read only once.
 
     Parameters:
         path (str): The path to the root folder containing character state animations.
+        colorkey (tuple, optional): The colorkey applied to the frames. Defaults to None.
 
     Returns:
         states (dict): A dictionary containing character states, organized by form and movement.
     """
-    states = {}
-    root_folder = path
-
-    for forms in os.listdir(root_folder):
-        full_path = root_folder + forms + "/"
-        states[forms] = {}
-        for moves in os.listdir(full_path):
-            full_path = root_folder + forms + "/" + moves + "/"
-            states[forms][moves] = []
-            for _, __, img_files in os.walk(full_path):
-                for img in img_files:
-                    full_path = root_folder + forms + "/" + moves + "/" + img
-                    image_surface = pygame.image.load(full_path)
-                    states[forms][moves].append(image_surface)
-
-    return states
+    return registry.character_states(path, colorkey)
 
 
-def import_folder(path):
+def import_folder(path, colorkey=None):
     """
     Imports a collection of image frames from the specified path.
+    - The frames are loaded through the asset registry, so every folder is read only once.
 
     Parameters:
         path (str): The path to the folder containing image frames.
+        colorkey (tuple, optional): The colorkey applied to the frames. Defaults to None.
 
     Returns:
-        frames (list): A list of pygame.Surface objects representing the image frames.
+        frames (tuple): A tuple of pygame.Surface objects representing the image frames.
     """
-    frames = []
-
-    for img_files in os.listdir(path):
-        full_path = path + "/" + img_files
-        image_surface = pygame.image.load(full_path)
-        frames.append(image_surface)
-
-    return frames
+    return registry.folder(path, colorkey)
 
 
 def import_csv_layout(path):
@@ -74,6 +66,8 @@ def import_csv_layout(path):
 def import_cut_graphics(path, type, pos=(0, 0)):
     """
     Imports and cuts graphics from the specified path.
+    - Cut sheets are shared process-wide, every sheet is decoded and cut only once.
+    - The frames are returned as a tuple, so the instances sharing them can't modify the list.
 
     Parameters:
         path (str): The path to the image file.
@@ -81,39 +75,62 @@ def import_cut_graphics(path, type, pos=(0, 0)):
         pos (tuple, optional): The position to start cutting the graphics. Defaults to (0, 0).
 
     Returns:
-        cut_tiles (list): A list of pygame.Surface objects representing the cut graphics.
+        cut_tiles (tuple): A tuple of pygame.Surface objects representing the cut graphics.
+    """
+    if type == "enemy":
+        return cut_sheet(path, "enemy", tuple(enemy_tile_list))
+    if type == "coin":
+        return cut_sheet(path, "coin", (tuple(pos), tile_size))
+    return cut_sheet(path, "grid", (tile_size, tile_size))
+
+
+@lru_cache(maxsize=None)
+def cut_sheet(path, cut, geometry):
     """
-    surface = pygame.image.load(path).convert_alpha()
+    Cuts a spritesheet into frames, the results are cached by (path, cut type, tile geometry).
+    - Use cut_sheet.cache_info() to check the hit/miss counts of the cache.
 
-    tile_num_x = int(surface.get_size()[0] / tile_size)
-    tile_num_y = int(surface.get_size()[1] / tile_size)
+    Parameters:
+        path (str): The path to the image file.
+        cut (str): The way the sheet is cut ("grid", "coin" or "enemy").
+        geometry (tuple): The tile geometry of the cut, as described by the cut type.
+
+    Returns:
+        cut_tiles (tuple): A tuple of pygame.Surface objects representing the cut graphics.
+    """
+    surface = registry.image(path)
 
     cut_tiles = []
-    if type != "enemy":
-        if type == "coin":
-            coin_surf = pygame.Surface((tile_size, tile_size))
-            coin_surf.blit(
-                surface,
-                (0, 0),
-                pygame.Rect(pos[0], pos[1], tile_size, tile_size),
-            )
-            return coin_surf
+    if cut == "coin":
+        pos, size = geometry
+        coin_surf = pygame.Surface((size, size))
+        coin_surf.blit(
+            surface,
+            (0, 0),
+            pygame.Rect(pos[0], pos[1], size, size),
+        )
+        return coin_surf
+
+    elif cut == "grid":
+        tile_width, tile_height = geometry
+        tile_num_x = int(surface.get_size()[0] / tile_width)
+        tile_num_y = int(surface.get_size()[1] / tile_height)
 
         for row in range(tile_num_y):
             for col in range(tile_num_x):
-                x = col * tile_size
-                y = row * tile_size
-                new_surf = pygame.Surface((tile_size, tile_size))
+                x = col * tile_width
+                y = row * tile_height
+                new_surf = pygame.Surface((tile_width, tile_height))
                 new_surf.blit(
                     surface,
                     (0, 0),
-                    pygame.Rect(x, y, tile_size, tile_size),
+                    pygame.Rect(x, y, tile_width, tile_height),
                 )
                 new_surf.set_colorkey((0, 0, 0))
                 cut_tiles.append(new_surf)
 
     else:
-        for enemy in enemy_tile_list:
+        for enemy in geometry:
 
             tile_width = enemy[2]
             tile_height = enemy[3]
@@ -128,4 +145,96 @@ def import_cut_graphics(path, type, pos=(0, 0)):
                 new_surf.set_colorkey((0, 0, 0))
                 cut_tiles.append(new_surf)
 
-    return cut_tiles
+    return tuple(cut_tiles)
+
+
+def import_tmx_layout(path):
+    """
+    Imports every tile layer of a Tiled map (TMX) file in a single pass.
+
+    - The file is streamed with an incremental XML parser, every layer is decoded as soon as it has been read.
+    - Layers can be encoded as csv or base64, and base64 layers can be compressed with zlib or gzip.
+    - Tiled stores global tile ids (gid), these are mapped back to the ids inside the tileset the tile belongs to
+      (the id minus the firstgid of its tileset), the same ids the exported CSV files contain.
+    - Empty tiles (gid 0) become -1.
+
+    Parameters:
+        path (str): The path to the TMX file.
+
+    Returns:
+        layers (dict): The layers of the map by name, each one a list of rows of tile ids.
+    """
+    firstgids = []
+    layers = {}
+    width = 0
+
+    for event, element in ElementTree.iterparse(path, events=("start", "end")):
+        if event == "start":
+            if element.tag == "tileset":
+                insort(firstgids, int(element.get("firstgid")))
+            elif element.tag == "layer":
+                width = int(element.get("width"))
+            continue
+
+        if element.tag == "layer":
+            data = element.find("data")
+            gids = decode_tmx_data(
+                data.text or "", data.get("encoding"), data.get("compression")
+            )
+            tile_ids = [tmx_tile_id(gid, firstgids) for gid in gids]
+            layers[element.get("name")] = [
+                tile_ids[row_start : row_start + width]
+                for row_start in range(0, len(tile_ids), width)
+            ]
+            element.clear()
+
+    return layers
+
+
+def decode_tmx_data(text, encoding, compression):
+    """
+    Decodes the data of a TMX layer into a list of global tile ids.
+
+    Parameters:
+        text (str): The text content of the <data> element.
+        encoding (str): The encoding of the data ("csv" or "base64").
+        compression (str): The compression of base64 data ("zlib", "gzip" or None).
+
+    Returns:
+        gids (list): The global tile ids of the layer, row by row.
+    """
+    if encoding == "csv":
+        return [int(val) for val in text.replace("\n", "").split(",") if val.strip()]
+
+    if encoding != "base64":
+        raise ValueError(f"Unsupported TMX layer encoding: {encoding}")
+
+    data = base64.b64decode(text.strip())
+    if compression in ("zlib", "gzip"):
+        # wbits 47 lets zlib detect both the zlib and the gzip header
+        data = zlib.decompress(data, 47)
+    elif compression:
+        raise ValueError(f"Unsupported TMX layer compression: {compression}")
+
+    gids = array("I")
+    gids.frombytes(data)
+    if sys.byteorder == "big":
+        gids.byteswap()
+    return gids.tolist()
+
+
+def tmx_tile_id(gid, firstgids):
+    """
+    Maps a global tile id of a TMX file to the id of the tile inside its tileset.
+
+    Parameters:
+        gid (int): The global tile id, including the flip flags set by Tiled.
+        firstgids (list): The sorted firstgid values of the tilesets of the map.
+
+    Returns:
+        tile_id (int): The id of the tile inside its tileset, or -1 for an empty tile.
+    """
+    gid &= tmx_gid_mask
+    if gid == 0:
+        return -1
+    return gid - firstgids[bisect_right(firstgids, gid) - 1]
@@ -0,0 +1,138 @@
+# This file contains the tile type registry, that describes every tile id of every layer of the levels.
+# The properties of the tiles are stored as bit flags, so a tile can have several of them.
+from settings import enemies_by_id, boss_tile_id
+
+# The tile blocks the movement of the player and the boss.
+SOLID = 1
+
+# The player jumps up when landing on the tile.
+BOUNCY = 2
+
+# The block gives coins when bumped.
+COIN = 4
+
+# The block gives a power up when bumped.
+POWER_UP = 8
+
+# The player finishes the level when touching the tile.
+GOAL = 16
+
+# The enemies turn around when touching the tile.
+CONSTRAIN = 32
+
+
+class TileType:
+    """
+    Describes a tile id of a layer.
+
+    Attributes:
+        name (str): The name of the tile type.
+        flags (int): The property flags of the tile.
+        factory (str): The name of the Level method creating the sprite of the tile (None for static tiles).
+        texture (str): The path to the texture of the tile, for layers without a tile sheet (None otherwise).
+        data (dict): Extra data passed to the factory (e.g. the specification of an enemy).
+    """
+
+    __slots__ = ("name", "flags", "factory", "texture", "data")
+
+    def __init__(self, name, flags=0, factory=None, texture=None, data=None):
+        self.name = name
+        self.flags = flags
+        self.factory = factory
+        self.texture = texture
+        self.data = data
+
+
+class TileTable:
+    """
+    The tile types of a layer, in a table indexed by tile id.
+
+    - Looking up a tile id is a single list indexing, negative ids (e.g. the boss) are shifted into the table.
+    - Ids that aren't registered get the default type of the layer (None if the layer has no default).
+
+    Attributes:
+        default (TileType): The type of the ids that aren't registered.
+        first_id (int): The tile id of the first entry of the table.
+        types (list): The tile types, from first_id upwards.
+
+    Methods:
+        - register(tile_id, tile_type)
+        - flags(count)
+        - textures()
+    """
+
+    def __init__(self, default=None):
+        self.default = default
+        self.first_id = 0
+        self.types = []
+
+    def register(self, tile_id, tile_type):
+        """Registers the type of a tile id, growing the table as needed."""
+        if tile_id < self.first_id:
+            self.types[:0] = [None] * (self.first_id - tile_id)
+            self.first_id = tile_id
+        index = tile_id - self.first_id
+        if index >= len(self.types):
+            self.types.extend([None] * (index + 1 - len(self.types)))
+        self.types[index] = tile_type
+
+    def __getitem__(self, tile_id):
+        index = tile_id - self.first_id
+        if 0 <= index < len(self.types):
+            tile_type = self.types[index]
+            if tile_type is not None:
+                return tile_type
+        return self.default
+
+    def flags(self, count):
+        """Returns the flags of the tile ids from 0 to count - 1, as a list indexed by tile id."""
+        types = (self[tile_id] for tile_id in range(count))
+        return [tile_type.flags if tile_type else 0 for tile_type in types]
+
+    def textures(self):
+        """Returns the texture paths of the tile ids from 0 upwards, as a list indexed by tile id."""
+        types = (self[tile_id] for tile_id in range(len(self.types) + self.first_id))
+        return [tile_type.texture if tile_type else None for tile_type in types]
+
+
+# The layers whose tiles are merged into large colliders, and the flags of the tiles merged (tiles with other flags,
+# e.g. the bounce blocks, keep a collider per cell).
+merged_layers = {"base": SOLID}
+
+# The tile tables of every layer, as named in game_data.py.
+tile_types = {
+    "base": TileTable(TileType("terrain", SOLID)),
+    "goal": TileTable(TileType("castle", GOAL)),
+    "constrains": TileTable(TileType("constrain", CONSTRAIN)),
+    "background": TileTable(),
+    "animated": TileTable(
+        TileType("power-up-block", SOLID | POWER_UP, "add_question_block")
+    ),
+    "enemies": TileTable(),
+    "player": TileTable(),
+}
+
+# The first three terrain tiles are bounce blocks.
+for tile_id in (0, 1, 2):
+    tile_types["base"].register(tile_id, TileType("bounce-block", SOLID | BOUNCY))
+
+tile_types["background"].register(
+    0, TileType("cloud", texture="../Packages/Textures/map/decor/cloud.png")
+)
+tile_types["background"].register(
+    1, TileType("bush", texture="../Packages/Textures/map/decor/bush.png")
+)
+
+for tile_id in (0, 3):
+    tile_types["animated"].register(
+        tile_id, TileType("coin-block", SOLID | COIN, "add_question_block")
+    )
+
+for tile_id, specification in enemies_by_id.items():
+    tile_types["enemies"].register(
+        int(tile_id), TileType("enemy", 0, "add_enemy", data=specification)
+    )
+tile_types["enemies"].register(boss_tile_id, TileType("boss", 0, "add_boss"))
+
+tile_types["player"].register(1, TileType("player", 0, "add_player"))
+tile_types["player"].register(0, TileType("level-end", GOAL, "add_level_end"))
@@ -0,0 +1,320 @@
+import numpy as np
+import pygame
+from array import array
+from settings import tile_size
+
+
+def merge_cells(mergeable):
+    """
+    Greedily merges cells into maximal rectangles.
+    - Row by row, every free cell starts a rectangle, that is grown right as far as possible, then down as far as the
+      whole width allows.
+
+    Parameters:
+        mergeable (array): A 2D boolean array (rows, columns), True for the cells to merge.
+
+    Returns:
+        rects (list): The merged rectangles as [column, row, width, height] lists, in cells.
+    """
+    free = mergeable.copy()
+    rows, columns = free.shape
+    rects = []
+    for row in range(rows):
+        line = free[row]
+        for column in np.flatnonzero(line).tolist():
+            if not line[column]:
+                continue
+            width = 1
+            while column + width < columns and line[column + width]:
+                width += 1
+            height = 1
+            while row + height < rows and free[row + height, column : column + width].all():
+                height += 1
+            free[row : row + height, column : column + width] = False
+            rects.append([column, row, width, height])
+    return rects
+
+
+class TileCell:
+    """
+    A collider of a TileMap, returned by its collision checks.
+    It's either a single non-empty cell, or a rectangle of merged cells with the same flags.
+
+    Attributes:
+        rect (pygame.Rect): The area of the collider in world coordinates.
+        id (int): The tile id of the cell (of the top left cell, for merged cells).
+        flags (int): The property flags of the tile (see tile_types.py).
+    """
+
+    __slots__ = ("rect", "id", "flags")
+
+    def __init__(self, rect, tile_id, flags):
+        self.rect = rect
+        self.id = tile_id
+        self.flags = flags
+
+
+class TileMap:
+    """
+    Represents a static tile layer, stored as an array of tile ids instead of one sprite per tile.
+
+    - The tiles are kept in a flat array of 16 bit integers (row by row), -1 is an empty cell.
+    - Every tile id has a shared texture, and a set of property flags (e.g. solid, bouncy) from the tile type registry,
+      both are looked up by indexing a table with the id.
+      Ids without a texture are kept (they still collide), but they aren't drawn.
+    - Collision checks compute the cells a rect overlaps, and return the colliders of the non-empty ones.
+    - The tiles with exactly the merged flags (e.g. plain solid terrain) are merged into maximal rectangles, so a floor
+      of dozens of cells is a single collider. Tiles with other flags (e.g. bounce blocks) keep a collider per cell.
+      The merged rectangles can be passed in from the compiled level, and are merged again locally when a tile changes.
+    - The layer is drawn straight from the array, only the cells inside the drawn area are looked at.
+
+    Attributes:
+        width (int): The number of columns of the layer.
+        height (int): The number of rows of the layer.
+        cell_size (int): The width and height of a cell in pixels.
+        tiles (array): The tile ids of the cells, row by row.
+        textures (list): The texture of every tile id used by the layer, None for the ids without a texture.
+        flags (array): The property flags of every tile id used by the layer.
+        offset (tuple): The offset of the textures from the bottom left corner of their cell.
+        margin (int): The number of extra columns to look at when drawing, for textures wider than a cell.
+        count (int): The number of non-empty cells.
+        merged_flags (int): The flags of the tiles merged into larger colliders (None if no tiles are merged).
+        colliders (list): The colliders of the layer as TileCells, None for the removed ones.
+        free_colliders (list): The indices of the removed colliders, reused by the next colliders.
+        collider_ids (array): The index of the collider of every cell, row by row, -1 for empty cells.
+
+    Methods:
+        - tile(column, row)
+        - set_tile(column, row, tile_id)
+        - merged_rects()
+        - collide(rect)
+        - occupancy(flags=0)
+        - draw_area(surface, area)
+    """
+
+    def __init__(
+        self,
+        layout,
+        textures=(),
+        types=None,
+        offset=(0, 0),
+        cell_size=tile_size,
+        merged_flags=None,
+        merged=None,
+    ):
+        self.height = len(layout)
+        self.width = max((len(row) for row in layout), default=0)
+        self.cell_size = cell_size
+        self.offset = offset
+        self.types = types
+        self.merged_flags = merged_flags
+
+        self.tiles = array("h")
+        for row in layout:
+            self.tiles.extend(row)
+            self.tiles.extend([-1] * (self.width - len(row)))
+        self.count = len(self.tiles) - self.tiles.count(-1)
+
+        # Pad the textures up to the highest id of the layer, so drawing never has to check the bounds.
+        last_id = max(self.tiles, default=-1)
+        self.textures = list(textures) + [None] * (last_id + 1 - len(textures))
+        if types is not None:
+            self.flags = array("B", types.flags(last_id + 1))
+        else:
+            self.flags = array("B", bytes(last_id + 1))
+
+        widest = max(
+            (texture.get_width() for texture in self.textures if texture is not None),
+            default=cell_size,
+        )
+        self.margin = -(-(widest + abs(offset[0])) // cell_size)
+
+        self.colliders = []
+        self.free_colliders = []
+        self.collider_ids = array("i", [-1]) * len(self.tiles)
+        self.add_colliders(0, 0, self.width, self.height, merged)
+
+    def __len__(self):
+        return self.count
+
+    def tile(self, column, row):
+        """Returns the tile id of a cell, -1 if the cell is empty or outside the layer."""
+        if 0 <= column < self.width and 0 <= row < self.height:
+            return self.tiles[row * self.width + column]
+        return -1
+
+    def set_tile(self, column, row, tile_id):
+        """
+        Changes the tile of a cell (-1 empties it), and merges the colliders around it again.
+        - Only the colliders touching the cell or its neighbours are rebuilt, the rest of the layer isn't looked at.
+        - Baked chunks of the layer have to be invalidated by the owner of the BakedLayer.
+        """
+        index = row * self.width + column
+        old_id = self.tiles[index]
+        self.tiles[index] = tile_id
+        self.count += (tile_id != -1) - (old_id != -1)
+        if tile_id >= len(self.flags):
+            self.textures.extend([None] * (tile_id + 1 - len(self.textures)))
+            if self.types is not None:
+                self.flags = array("B", self.types.flags(tile_id + 1))
+            else:
+                self.flags.extend(bytes(tile_id + 1 - len(self.flags)))
+
+        # The area to merge again: the cell, and every collider touching it or its neighbours.
+        left, top = column, row
+        right, bottom = column + 1, row + 1
+        removed = set()
+        for near_row in range(max(row - 1, 0), min(row + 2, self.height)):
+            for near_column in range(max(column - 1, 0), min(column + 2, self.width)):
+                collider = self.collider_ids[near_row * self.width + near_column]
+                if collider != -1:
+                    removed.add(collider)
+
+        size = self.cell_size
+        for collider in removed:
+            rect = self.colliders[collider].rect
+            first_column, first_row = rect.left // size, rect.top // size
+            last_column, last_row = rect.right // size, rect.bottom // size
+            for cell_row in range(first_row, last_row):
+                row_start = cell_row * self.width
+                self.collider_ids[row_start + first_column : row_start + last_column] = array(
+                    "i", [-1]
+                ) * (last_column - first_column)
+            self.colliders[collider] = None
+            self.free_colliders.append(collider)
+            left, top = min(left, first_column), min(top, first_row)
+            right, bottom = max(right, last_column), max(bottom, last_row)
+
+        self.add_colliders(left, top, right, bottom)
+
+    def add_colliders(self, left, top, right, bottom, merged=None):
+        """
+        Creates the colliders of the cells in an area, that aren't covered by a collider yet.
+
+        Parameters:
+            left, top, right, bottom (int): The area in cells, the right and bottom edges are excluded.
+            merged (list, optional): The merged rectangles of the area (e.g. from the compiled level),
+                                     merged from the tiles if None.
+        """
+        width = self.width
+        tiles = np.frombuffer(self.tiles, dtype=np.int16).reshape(self.height, width)
+        free = np.frombuffer(self.collider_ids, dtype=np.int32).reshape(self.height, width)
+        area = (slice(top, bottom), slice(left, right))
+        occupied = (tiles[area] != -1) & (free[area] == -1)
+
+        if self.merged_flags is not None:
+            if merged is None:
+                flags = np.frombuffer(self.flags, dtype=np.uint8)
+                mergeable = occupied.copy()
+                mergeable[mergeable] = flags[tiles[area][mergeable]] == self.merged_flags
+                merged = [
+                    [column + left, row + top, rect_width, rect_height]
+                    for column, row, rect_width, rect_height in merge_cells(mergeable)
+                ]
+            for column, row, rect_width, rect_height in merged:
+                self.add_collider(column, row, rect_width, rect_height)
+            occupied &= free[area] == -1
+
+        for row, column in np.argwhere(occupied).tolist():
+            self.add_collider(column + left, row + top, 1, 1)
+
+    def add_collider(self, column, row, width, height):
+        """Adds a collider covering a rectangle of cells, its tile id and flags are the top left cell's."""
+        size = self.cell_size
+        tile_id = self.tiles[row * self.width + column]
+        collider = TileCell(
+            pygame.Rect(column * size, row * size, width * size, height * size),
+            tile_id,
+            self.flags[tile_id],
+        )
+        if self.free_colliders:
+            index = self.free_colliders.pop()
+            self.colliders[index] = collider
+        else:
+            index = len(self.colliders)
+            self.colliders.append(collider)
+        for cell_row in range(row, row + height):
+            row_start = cell_row * self.width
+            self.collider_ids[row_start + column : row_start + column + width] = array(
+                "i", [index]
+            ) * width
+
+    def merged_rects(self):
+        """Returns the colliders of the merged tiles, as [column, row, width, height] lists in cells."""
+        size = self.cell_size
+        return [
+            [collider.rect.x // size, collider.rect.y // size, collider.rect.w // size, collider.rect.h // size]
+            for collider in self.colliders
+            if collider is not None and collider.flags == self.merged_flags
+        ]
+
+    def cell_range(self, rect):
+        """Returns the columns and rows overlapped by a rect, clipped to the layer."""
+        size = self.cell_size
+        columns = range(max(rect.left // size, 0), min((rect.right - 1) // size + 1, self.width))
+        rows = range(max(rect.top // size, 0), min((rect.bottom - 1) // size + 1, self.height))
+        return columns, rows
+
+    def collide(self, rect):
+        """
+        Finds the colliders overlapped by a rect.
+
+        Parameters:
+            rect (pygame.Rect): The rect to check, in world coordinates.
+
+        Returns:
+            colliders (list): The overlapped colliders as TileCell objects, in the order their first cell is found,
+                              row by row.
+        """
+        columns, rows = self.cell_range(rect)
+        collider_ids = self.collider_ids
+
+        found = {}
+        for row in rows:
+            row_start = row * self.width
+            for column in columns:
+                collider = collider_ids[row_start + column]
+                if collider != -1:
+                    found[collider] = None
+        colliders = self.colliders
+        return [colliders[collider] for collider in found]
+
+    def occupancy(self, flags=0):
+        """
+        Returns a 2D boolean NumPy array (rows, columns) of the cells.
+
+        Parameters:
+            flags (int, optional): Only the tiles with any of these flags are True. Defaults to 0, every non-empty cell.
+        """
+        tiles = np.frombuffer(self.tiles, dtype=np.int16).reshape(self.height, self.width)
+        occupied = tiles != -1
+        if flags:
+            flagged = (np.frombuffer(self.flags, dtype=np.uint8) & flags) != 0
+            occupied[occupied] = flagged[tiles[occupied]]
+        return occupied
+
+    def draw_area(self, surface, area):
+        """
+        Draws the tiles visible inside an area of the world.
+
+        Parameters:
+            surface (pygame.Surface): The surface to draw upon, its top left corner is the top left corner of the area.
+            area (pygame.Rect): The area of the world to draw, in world coordinates.
+        """
+        size = self.cell_size
+        first = max(area.left // size - self.margin, 0)
+        last = min((area.right - 1) // size + self.margin, self.width - 1)
+        offset_x = self.offset[0] - area.left
+        offset_y = self.offset[1] - area.top + size
+        textures = self.textures
+        tiles = self.tiles
+
+        for row in range(self.height):
+            row_start = row * self.width
+            bottom = row * size + offset_y
+            for column in range(first, last + 1):
+                tile_id = tiles[row_start + column]
+                if tile_id != -1:
+                    texture = textures[tile_id]
+                    if texture is not None:
+                        surface.blit(texture, (column * size + offset_x, bottom - texture.get_height()))
@@ -1,5 +1,7 @@
 import pygame
 from support import import_cut_graphics
+from assets import registry
+from tile_types import SOLID
 import random
 
 
@@ -9,19 +11,19 @@ class Tile(pygame.sprite.Sprite):
     - Basic tiles are just rectangular entities, they do not have an appearance.
     - They are mostly extended by other tile classes, or used as invisible detectors
       (such as goal tiles, that make the player win when touched).
+    - Tiles keep their position in world coordinates, the camera of the level applies the scrolling when drawing.
 
     - Attributes:
-        - image: An empty pygame.Surface.
-        - rect: A pygame.Rect representing the position and size of the tile on the game screen.
+        - image: The image of the tile, an empty pygame.Surface if no image is given.
+        - rect: A pygame.Rect representing the position and size of the tile in the world.
 
     - Methods:
-        - __init__(self, size, x, y, surface)
-        - update(self, shift)
+        - __init__(self, size, x, y, image=None)
 
 
     """
 
-    def __init__(self, size, x, y):
+    def __init__(self, size, x, y, image=None):
         """
         Initializes a new Tile instance.
 
@@ -29,27 +31,16 @@ class Tile(pygame.sprite.Sprite):
             size (tuple): A tuple (width, height) representing the size of the tile.
             x (int): The x-coordinate of the top-left corner of the tile.
             y (int): The y-coordinate of the top-left corner of the tile.
+            image (pygame.Surface, optional): The image of the tile, an empty surface is created only if it's missing.
 
         Returns:
             None
         """
         super().__init__()
 
-        # Create the tile image and set its position
-        self.image = pygame.Surface(size)
-        self.rect = self.image.get_rect(topleft=(x, y))
-
-    def update(self, shift):
-        """
-        Updates the tile's position by moving it horizontally, when screen-scrolling.
-
-        Parameters:
-            shift (int): The amount to move the tile's position horizontally.
-
-        Returns:
-            None
-        """
-        self.rect.x += shift
+        # Set the tile image and its position
+        self.image = image if image is not None else pygame.Surface(size)
+        self.rect = pygame.Rect((x, y), size)
 
 
 class StaticTile(Tile):
@@ -68,10 +59,7 @@ class StaticTile(Tile):
     """
 
     def __init__(self, size, x, y, surface):
-        super().__init__(size, x, y)
-
-        # Set the image of the static tile
-        self.image = surface
+        super().__init__(size, x, y, surface)
 
 
 class Background(StaticTile):
@@ -88,7 +76,7 @@ class Background(StaticTile):
         - Methods:
             __init__(self, path, size, x, y): Constructor method for the Background class. Initializes a background tile with the specified image, size, and position.
         """
-        super().__init__(size, x, y, pygame.image.load(path).convert_alpha())
+        super().__init__(size, x, y, registry.image(path))
         offset_x = x + size[0]
         offset_y = y + size[1]
         self.rect = self.image.get_rect(bottomleft=(offset_x, offset_y))
@@ -108,22 +96,23 @@ class AnimatedTile(Tile):
         path (str): The file path of the image sequence used for animation.
         type (str): The type of animated tile to distinguish behaviour (e.g. "coin-block").
         frame_count (int): The number of animation frames.
+        flags (int): The property flags of the tile (see tile_types.py), animated tiles are solid by default.
 
     - Methods:
-        __init__(self, size, x, y, sprite_start_index, path, type, frame_count)
+        __init__(self, size, x, y, sprite_start_index, path, type, frame_count, flags=SOLID)
         bumped(self, strength)
         get_information(self)
         animate(self)
-        update(self, shift)
+        update(self)
     """
 
-    def __init__(self, size, x, y, sprite_start_index, path, type, frame_count):
-        super().__init__(size, x, y)
+    def __init__(self, size, x, y, sprite_start_index, path, type, frame_count, flags=SOLID):
+        self.frames = import_cut_graphics(path, type)
+        super().__init__(size, x, y, self.frames[sprite_start_index])
+        self.flags = flags
         self.start_frame_index = sprite_start_index
         self.frame_count = frame_count
-        self.frames = import_cut_graphics(path, type)
         self.frame_index = self.start_frame_index
-        self.image = self.frames[self.frame_index]
         self.pos = (self.rect.y, self.rect.x)
         self.type = type
 
@@ -143,10 +132,10 @@ class AnimatedTile(Tile):
             self.rect.y += strength
             self.coin_count -= 1
         if self.coin_count == 0:
-            self.image = pygame.image.load(
-                "../Packages/Textures/map/blocks/static/empty_question_block.png"
+            self.image = registry.image(
+                "../Packages/Textures/map/blocks/static/empty_question_block.png",
+                (0, 0, 0),
             )
-            self.image.set_colorkey((0, 0, 0))
 
     def get_information(self):
         """
@@ -165,15 +154,9 @@ class AnimatedTile(Tile):
                 self.frame_index -= self.frame_count
             self.image = self.frames[int(self.frame_index)]
 
-    def update(self, shift):
-        """
-        Moves and animates the tiles.
-
-        Parameters:
-            shift (int): The value to move the tile's position horizontally.
-        """
+    def update(self):
+        """Animates the tile, and moves it back to its place after a bump."""
         self.animate()
-        self.rect.x += shift
         if self.rect.y < self.pos[0]:
             self.rect.y += 4
         else:
@@ -0,0 +1,108 @@
+from settings import chunk_width
+
+
+class Trigger:
+    """
+    An invisible volume of the level, that fires when the player touches it (e.g. the goal, or the kill plane).
+
+    Attributes:
+        kind (str): The kind of the trigger, it selects what happens when it fires (see Level.trigger_handlers).
+        rect (pygame.Rect): The volume of the trigger in world coordinates.
+        data: Extra data of the trigger (e.g. the spawn point of a checkpoint), None if it has none.
+        enclose (bool): If True, the trigger only fires once the player is entirely inside the volume.
+    """
+
+    __slots__ = ("kind", "rect", "data", "enclose")
+
+    def __init__(self, kind, rect, data=None, enclose=False):
+        self.kind = kind
+        self.rect = rect
+        self.data = data
+        self.enclose = enclose
+
+
+class TriggerIndex:
+    """
+    Interval index of the trigger volumes of a level, over the world x-axis.
+
+    - The level is cut into buckets of columns, every trigger is listed in the buckets its volume spans.
+    - A query only looks at the buckets under the rect (one or two for the player), so finding the triggers the
+      player touches takes the same time, however many triggers the level has.
+    - Volumes reaching outside the level (e.g. the kill plane) are listed in the buckets at the edges, rects outside
+      the level are looked up in those.
+
+    Attributes:
+        bucket_width (int): The width of a bucket in pixels.
+        buckets (list): The triggers of every bucket, in the order they were added.
+        order (dict): The order every trigger was added in.
+
+    Methods:
+        - add(kind, rect, data=None, enclose=False)
+        - remove(trigger)
+        - query(rect)
+    """
+
+    def __init__(self, width, bucket_width=chunk_width):
+        self.bucket_width = bucket_width
+        self.buckets = [[] for _ in range(max(-(-width // bucket_width), 1))]
+        self.order = {}
+
+    def __len__(self):
+        return len(self.order)
+
+    def bucket_range(self, rect):
+        """Returns the range of buckets a rect spans, clipped to the level."""
+        last = len(self.buckets) - 1
+        first_bucket = min(max(rect.left // self.bucket_width, 0), last)
+        last_bucket = min(max((rect.right - 1) // self.bucket_width, 0), last)
+        return range(first_bucket, last_bucket + 1)
+
+    def add(self, kind, rect, data=None, enclose=False):
+        """
+        Adds a trigger volume to the index.
+
+        Parameters:
+            kind (str): The kind of the trigger.
+            rect (pygame.Rect): The volume of the trigger in world coordinates.
+            data (optional): Extra data of the trigger. Defaults to None.
+            enclose (bool, optional): If True, the trigger only fires once the rect is entirely inside the volume.
+                                      Defaults to False.
+
+        Returns:
+            Trigger: The new trigger.
+        """
+        trigger = Trigger(kind, rect, data, enclose)
+        self.order[trigger] = len(self.order)
+        for bucket in self.bucket_range(rect):
+            self.buckets[bucket].append(trigger)
+        return trigger
+
+    def remove(self, trigger):
+        """Removes a trigger from the index (e.g. a checkpoint that was reached)."""
+        if self.order.pop(trigger, None) is None:
+            return
+        for bucket in self.bucket_range(trigger.rect):
+            self.buckets[bucket].remove(trigger)
+
+    def query(self, rect):
+        """
+        Finds the triggers fired by a rect.
+
+        Parameters:
+            rect (pygame.Rect): The rect to check (e.g. the player), in world coordinates.
+
+        Returns:
+            triggers (list): The fired triggers, in the order they were added.
+        """
+        found = {}
+        for bucket in self.bucket_range(rect):
+            for trigger in self.buckets[bucket]:
+                if trigger.enclose:
+                    if trigger.rect.contains(rect):
+                        found[trigger] = None
+                elif trigger.rect.colliderect(rect):
+                    found[trigger] = None
+
+        if len(found) > 1:
+            return sorted(found, key=self.order.__getitem__)
+        return list(found)